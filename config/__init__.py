@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+"""
+配置管理包。
+"""
@@ -4,7 +4,51 @@
 """
 import json
 import os
-from typing import Any, Dict, List, Optional
+from collections import namedtuple
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# 测试场景记录，字段默认值与新建场景表单一致；名称缺省为None，由界面决定显示文本
+Scenario = namedtuple(
+    'Scenario',
+    'name input_len output_len concurrency num_prompts range_ratio prefix_len',
+    defaults=(None, 50, 1024, 4, 20, 1.0, 0)
+)
+
+# 场景字段名及其默认值，按Scenario字段顺序排列
+_SCENARIO_KEYS = Scenario._fields
+_SCENARIO_DEFAULTS = Scenario._field_defaults
+
+
+def to_scenario(data: Dict[str, Any]) -> Scenario:
+    """
+    将场景字典转换为场景记录，缺失的字段使用默认值
+    
+    Args:
+        data: 场景字典
+        
+    Returns:
+        场景记录
+    """
+    if data.keys() >= _SCENARIO_DEFAULTS.keys():
+        # 字段齐全（界面保存的场景总是如此）时直接按顺序取值
+        return Scenario._make([data[key] for key in _SCENARIO_KEYS])
+    get = data.get
+    return Scenario._make([get(key, default) for key, default in _SCENARIO_DEFAULTS.items()])
+
+
+def _display_row(index: int, scenario: Scenario) -> tuple:
+    """
+    生成场景在列表中的显示行
+    
+    Args:
+        index: 场景索引
+        scenario: 场景记录
+        
+    Returns:
+        各列的显示字符串，未命名场景按序号命名
+    """
+    return (scenario.name or f"场景{index+1}",) + tuple(map(str, scenario[1:]))
 
 
 class ConfigSection:
@@ -126,15 +170,93 @@ class ScenarioConfig(ConfigSection):
         ]
         super().__init__(file_path, {"scenarios": default_scenarios})
     
+    def load(self) -> None:
+        """从文件加载配置"""
+        super().load()
+        self._invalidate_views()
+    
+    def set(self, key: str, value: Any) -> None:
+        """设置配置项"""
+        super().set(key, value)
+        self._invalidate_views()
+    
+    def update(self, config_dict: Dict[str, Any]) -> None:
+        """批量更新配置"""
+        super().update(config_dict)
+        self._invalidate_views()
+    
+    def _invalidate_views(self) -> None:
+        """场景列表变更后清除派生的缓存"""
+        self._records: Optional[Tuple[Scenario, ...]] = None
+        self._columns: Optional[List[list]] = None
+        self._display_rows: Optional[List[tuple]] = None
+    
+    def _splice_records(self, index: int, removed: int, added: List[Dict[str, Any]]) -> None:
+        """
+        场景列表局部变更后同步更新记录缓存，只转换新增或修改的场景
+        
+        Args:
+            index: 变更位置
+            removed: 被替换或删除的场景数量
+            added: 在该位置插入的场景
+        """
+        if self._records is not None:
+            self._records = (self._records[:index] + tuple(to_scenario(s) for s in added)
+                             + self._records[index + removed:])
+        self._columns = None
+        
+        if self._display_rows is not None:
+            records = self.get_records()
+            start = index + len(added)
+            old_tail = self._display_rows[index + removed:]
+            rows = self._display_rows[:index]
+            rows.extend(_display_row(i, records[i]) for i in range(index, start))
+            if len(added) == removed:
+                rows.extend(old_tail)
+            else:
+                # 行数变化后其后未命名场景的序号随之改变，只需重新生成这些行
+                rows.extend(row if records[i].name else _display_row(i, records[i])
+                            for i, row in enumerate(old_tail, start))
+            self._display_rows = rows
+    
     def get_scenarios(self) -> List[Dict[str, Any]]:
         """获取所有测试场景"""
         return self.config.get("scenarios", [])
     
+    def get_records(self) -> Tuple[Scenario, ...]:
+        """获取所有测试场景的记录形式，结果会缓存到场景变更为止"""
+        if self._records is None:
+            self._records = tuple(to_scenario(s) for s in self.get_scenarios())
+        return self._records
+    
+    def get_display_rows(self) -> List[tuple]:
+        """
+        获取所有测试场景的显示行，场景变更时只更新受影响的行
+        
+        Returns:
+            各场景的显示字符串元组列表
+        """
+        if self._display_rows is None:
+            self._display_rows = [_display_row(i, s) for i, s in enumerate(self.get_records())]
+        return self._display_rows
+    
+    def columns(self) -> List[list]:
+        """
+        按列获取所有测试场景的字段值，结果会缓存到场景变更为止
+        
+        Returns:
+            与Scenario字段顺序一致的各列列表
+        """
+        if self._columns is None:
+            self._columns = [list(col) for col in zip(*self.get_records())] or [[] for _ in Scenario._fields]
+        return self._columns
+    
     def add_scenario(self, scenario: Dict[str, Any]) -> None:
         """添加测试场景"""
         if "scenarios" not in self.config:
             self.config["scenarios"] = []
         self.config["scenarios"].append(scenario)
+        self._splice_records(len(self.config["scenarios"]) - 1, 0, [scenario])
         self.save()
     
     def update_scenario(self, index: int, scenario: Dict[str, Any]) -> bool:
@@ -143,6 +265,7 @@ class ScenarioConfig(ConfigSection):
         if 0 <= index < len(scenarios):
             scenarios[index] = scenario
             self.config["scenarios"] = scenarios
+            self._splice_records(index, 1, [scenario])
             self.save()
             return True
         return False
@@ -153,9 +276,40 @@ class ScenarioConfig(ConfigSection):
         if 0 <= index < len(scenarios):
             del scenarios[index]
             self.config["scenarios"] = scenarios
+            self._splice_records(index, 1, [])
             self.save()
             return True
         return False
+    
+    def delete_scenarios(self, indices: List[int]) -> bool:
+        """
+        批量删除测试场景，只保存一次配置文件
+        
+        Args:
+            indices: 要删除的场景索引
+            
+        Returns:
+            是否删除成功；任一索引无效时不删除任何场景
+        """
+        scenarios = self.get_scenarios()
+        removed = set(indices)
+        if not removed or not all(0 <= i < len(scenarios) for i in removed):
+            return False
+        
+        self.config["scenarios"] = [s for i, s in enumerate(scenarios) if i not in removed]
+        
+        # 一次性更新记录缓存，其后未命名场景的序号随之改变
+        if self._records is not None:
+            self._records = tuple(r for i, r in enumerate(self._records) if i not in removed)
+        self._columns = None
+        if self._display_rows is not None:
+            records = self.get_records()
+            kept = (row for i, row in enumerate(self._display_rows) if i not in removed)
+            self._display_rows = [row if records[i].name else _display_row(i, records[i])
+                                  for i, row in enumerate(kept)]
+        
+        self.save()
+        return True
 
 
 class AppConfig(ConfigSection):
@@ -3,22 +3,22 @@
 主应用窗口模块，实现UI界面。
 """
 import os
-import sys
+import time
 import asyncio
 import threading
+import concurrent.futures
+from datetime import datetime
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 from typing import Dict, List, Any, Optional, Callable
 
 # 导入配置管理模块
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config.config_manager import ConfigManager
 from utils.security import SecureStorage, mask_sensitive_data
 from utils.system_info import collect_system_info, format_system_info_markdown
 from utils.email import EmailSender, create_round_email_body, create_final_email_body
 from utils.file_utils import (create_log_directory, create_markdown_summary, 
                              create_round_markdown, write_json_file)
-from core.benchmark import run_benchmark, sample_random_requests, save_benchmark_result
 
 # 导入其他标签页模块
 from ui.main_tab import MainTab
@@ -40,7 +40,8 @@ class AsyncTkApp:
         """
         self.root = root
         self.loop = asyncio.new_event_loop()
-        self.tasks = []
+        # 仅保存仍在运行的任务，完成后自动移除
+        self.tasks: set = set()
     
     def start(self):
         """启动异步事件循环"""
@@ -54,7 +55,7 @@ class AsyncTkApp:
     def stop(self):
         """停止异步事件循环"""
         if hasattr(self, 'thread'):
-            for task in self.tasks:
+            for task in list(self.tasks):
                 task.cancel()
             self.loop.call_soon_threadsafe(self.loop.stop)
             self.thread.join(timeout=1.0)
@@ -70,7 +71,8 @@ class AsyncTkApp:
             创建的任务
         """
         task = asyncio.run_coroutine_threadsafe(coro, self.loop)
-        self.tasks.append(task)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
         return task
 
 
@@ -96,6 +98,9 @@ class BenchmarkApp(tk.Tk):
         self.async_app = AsyncTkApp(self)
         self.async_app.start()
         
+        # 初始化后台工作线程池，供标签页执行耗时的短任务
+        self.worker_pool = concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix="ui-worker")
+        
         # 创建主框架
         self.notebook = ttk.Notebook(self)
         self.notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
@@ -130,7 +135,7 @@ class BenchmarkApp(tk.Tk):
         self.email_tab.load_config(self.config_manager.email.get_all())
         
         # 更新测试场景标签页配置
-        self.scenarios_tab.load_config(self.config_manager.scenarios.get_scenarios())
+        self.scenarios_tab.load_config(self.config_manager.scenarios.get_display_rows())
     
     def save_configs(self):
         """保存所有配置"""
@@ -176,6 +181,15 @@ class BenchmarkApp(tk.Tk):
             messagebox.showwarning("警告", "请至少选择一个测试场景")
             return
         
+        # 首次启动测试时才加载基准测试模块（依赖numpy/aiohttp/transformers等较重的库）
+        if not hasattr(self, '_benchmark_fns'):
+            try:
+                import core.benchmark
+            except ImportError as e:
+                messagebox.showerror("错误", f"加载基准测试模块失败: {e}")
+                return
+            self._benchmark_fns = core.benchmark
+        
         # 获取所有测试场景
         all_scenarios = self.config_manager.scenarios.get_scenarios()
         scenarios_to_run = [all_scenarios[i] for i in selected_scenarios]
@@ -198,9 +212,9 @@ class BenchmarkApp(tk.Tk):
         log_dir = create_log_directory()
         self.log_message(f"创建日志目录: {log_dir}")
         
-        # 创建摘要Markdown文件（初始版本，后续会更新）
-        summary_md = create_markdown_summary(log_dir, "LLM服务基准测试结果汇总报告", app_config, system_info)
-        self.log_message(f"创建摘要文件: {summary_md}")
+        # 摘要Markdown文件在所有场景完成后统一生成
+        summary_md = os.path.join(log_dir, "benchmark_summary.md")
+        self.log_message(f"摘要文件路径: {summary_md}")
         
         # 创建邮件发送器
         email_sender = None
@@ -238,9 +252,9 @@ class BenchmarkApp(tk.Tk):
         self.update_status("基准测试运行中...")
         self.log_message("开始基准测试...")
         
+        benchmark_fns = self._benchmark_fns
+        
         # 记录测试开始时间
-        import time
-        from datetime import datetime
         start_time = datetime.now()
         start_timestamp = start_time.strftime("%Y-%m-%d %H:%M:%S")
         self.log_message(f"测试开始时间: {start_timestamp}")
@@ -253,8 +267,40 @@ class BenchmarkApp(tk.Tk):
         failed_scenarios = 0
         failed_scenarios_info = []
         
-        # 存储所有轮次的测试结果
-        all_round_results = []
+        # 存储所有轮次的测试结果（按场景顺序预分配，失败的场景保持为None）
+        all_round_results: list = [None] * len(scenarios)
+        
+        # 这里需要实现获取tokenizer的逻辑
+        # 暂时使用模拟数据
+        from collections import namedtuple
+        MockTokenizer = namedtuple('MockTokenizer', ['vocab_size', 'decode'])
+        mock_tokenizer = MockTokenizer(
+            vocab_size=50000,
+            decode=lambda x: "".join([chr((i % 26) + 97) for i in x])
+        )
+        
+        # 测试配置模板，所有场景共享的字段只构建一次
+        test_config_template = {
+            "backend": app_config.get("backend", "openai"),
+            "api_url": f"{app_config.get('base_url', '')}{app_config.get('endpoint', '/v1/completions')}",
+            "base_url": app_config.get("base_url", ""),
+            "model_id": app_config.get("model", ""),
+            "model_name": app_config.get("model", ""),
+            "tokenizer": mock_tokenizer,
+            "logprobs": None,
+            "best_of": 1,
+            "request_rate": float("inf"),
+            "burstiness": 1.0,
+            "disable_tqdm": True,
+            "profile": False,
+            "selected_percentile_metrics": ["ttft", "tpot", "itl"],
+            "selected_percentiles": [99],
+            "ignore_eos": False,
+            "goodput_config_dict": {},
+            "input_requests": None,
+            "max_concurrency": None,
+            "api_key": api_key
+        }
         
         # 运行每个测试场景
         for i, scenario in enumerate(scenarios):
@@ -269,40 +315,13 @@ class BenchmarkApp(tk.Tk):
                             f"前缀长度={scenario.get('prefix_len')}")
             self.log_message(f"{'='*50}")
             
-            # 构建测试配置
-            test_config = {
-                "backend": app_config.get("backend", "openai"),
-                "api_url": f"{app_config.get('base_url', '')}{app_config.get('endpoint', '/v1/completions')}",
-                "base_url": app_config.get("base_url", ""),
-                "model_id": app_config.get("model", ""),
-                "model_name": app_config.get("model", ""),
-                "tokenizer": None,  # 需要实现获取tokenizer的逻辑
-                "logprobs": None,
-                "best_of": 1,
-                "request_rate": float("inf"),
-                "burstiness": 1.0,
-                "disable_tqdm": True,
-                "profile": False,
-                "selected_percentile_metrics": ["ttft", "tpot", "itl"],
-                "selected_percentiles": [99],
-                "ignore_eos": False,
-                "goodput_config_dict": {},
-                "max_concurrency": scenario.get("concurrency", 4),
-                "api_key": api_key
-            }
+            # 构建测试配置（基于模板，仅替换随场景变化的字段）
+            test_config = test_config_template.copy()
+            test_config["max_concurrency"] = scenario.get("concurrency", 4)
             
             # 生成随机请求
             try:
-                # 这里需要实现获取tokenizer的逻辑
-                # 暂时使用模拟数据
-                from collections import namedtuple
-                MockTokenizer = namedtuple('MockTokenizer', ['vocab_size', 'decode'])
-                mock_tokenizer = MockTokenizer(
-                    vocab_size=50000,
-                    decode=lambda x: "".join([chr((i % 26) + 97) for i in x])
-                )
-                
-                input_requests = sample_random_requests(
+                input_requests = benchmark_fns.sample_random_requests(
                     prefix_len=scenario.get("prefix_len", 0),
                     input_len=scenario.get("input_len", 50),
                     output_len=scenario.get("output_len", 1024),
@@ -311,22 +330,21 @@ class BenchmarkApp(tk.Tk):
                     tokenizer=mock_tokenizer
                 )
                 test_config["input_requests"] = input_requests
-                test_config["tokenizer"] = mock_tokenizer
                 
                 # 运行基准测试
                 start_time_scenario = time.time()
-                task = self.async_app.create_task(run_benchmark(test_config, self.log_message))
+                task = self.async_app.create_task(benchmark_fns.run_benchmark(test_config, self.log_message))
                 results = task.result()
                 duration = time.time() - start_time_scenario
                 
                 # 处理结果
                 if results:
                     # 保存本轮测试结果到列表中
-                    all_round_results.append({
+                    all_round_results[i] = {
                         "scenario": scenario,
                         "results": results,
                         "duration": int(duration)
-                    })
+                    }
                     
                     # 创建单轮Markdown文件
                     round_md = create_round_markdown(log_dir, scenario_index, scenario, results, int(duration))
@@ -345,7 +363,7 @@ class BenchmarkApp(tk.Tk):
                     
                     # 保存结果
                     result_file = os.path.join(log_dir, f"result_{scenario_index}.json")
-                    save_benchmark_result(results, test_config, result_file)
+                    benchmark_fns.save_benchmark_result(results, test_config, result_file)
                     
                     # 发送每轮邮件
                     if send_each and email_sender:
@@ -376,6 +394,9 @@ class BenchmarkApp(tk.Tk):
             # 等待一段时间，让系统稳定
             time.sleep(2)
         
+        # 去除失败场景的占位
+        all_round_results = [r for r in all_round_results if r is not None]
+        
         # 计算平均值
         if scenario_count > 0:
             avg_per_concurrency_output_throughput = total_per_concurrency_output_throughput / scenario_count
@@ -431,6 +452,10 @@ class BenchmarkApp(tk.Tk):
             email_sender.send_email_with_file_body(final_email_subject, final_email_file, [updated_summary_md])
             self.log_message("已发送最终汇总邮件")
         
+        # 关闭各轮邮件复用的SMTP连接
+        if email_sender:
+            email_sender.close()
+        
         # 更新状态
         self.update_status("基准测试完成")
         self.log_message(f"所有测试已完成！结果保存在: {log_dir}")
@@ -443,6 +468,9 @@ class BenchmarkApp(tk.Tk):
         # 停止异步应用
         self.async_app.stop()
         
+        # 关闭后台工作线程池
+        self.worker_pool.shutdown(wait=False, cancel_futures=True)
+        
         # 销毁窗口
         self.destroy()
     
@@ -461,6 +489,20 @@ class BenchmarkApp(tk.Tk):
         self.notebook.add(self.email_tab, text="邮件配置")
         self.notebook.add(self.scenarios_tab, text="测试场景")
         self.notebook.add(self.logs_tab, text="日志")
+        
+        # 标签页首次显示时才构建其界面
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+    
+    def on_tab_changed(self, event):
+        """
+        标签页切换事件处理
+        
+        Args:
+            event: 事件对象
+        """
+        tab = self.nametowidget(self.notebook.select())
+        if hasattr(tab, "_ensure_built"):
+            tab._ensure_built()
     
     def create_statusbar(self):
         """创建状态栏"""
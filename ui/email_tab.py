@@ -2,12 +2,16 @@
 """
 邮件配置标签页模块，实现邮件配置界面。
 """
+import re
 import tkinter as tk
 from tkinter import ttk, messagebox
 from typing import Dict, Any
 
 from utils.email import EmailSender
 
+# 端口输入校验（最多5位数字）
+_PORT_RE = re.compile(r'^\d{0,5}$')
+
 
 class EmailTab(ttk.Frame):
     """邮件配置标签页类"""
@@ -55,7 +59,9 @@ class EmailTab(ttk.Frame):
         # SMTP端口
         ttk.Label(self, text="SMTP端口:").grid(row=5, column=0, sticky=tk.W, pady=2)
         self.smtp_port_var = tk.IntVar(value=465)
-        ttk.Entry(self, textvariable=self.smtp_port_var, width=10).grid(row=5, column=1, sticky=tk.W, pady=2)
+        port_vcmd = (self.register(self._validate_port), '%P')
+        ttk.Entry(self, textvariable=self.smtp_port_var, width=10,
+                  validate='key', validatecommand=port_vcmd).grid(row=5, column=1, sticky=tk.W, pady=2)
         
         # 添加自定义邮件内容
         ttk.Label(self, text="自定义邮件内容:", font=("Arial", 10, "bold")).grid(row=6, column=0, sticky=tk.W, pady=5)
@@ -125,6 +131,18 @@ class EmailTab(ttk.Frame):
             "custom_email_content": self.custom_content_text.get(1.0, tk.END).strip()
         }
     
+    def _validate_port(self, proposed: str) -> bool:
+        """
+        校验SMTP端口输入
+        
+        Args:
+            proposed: 输入后的文本
+            
+        Returns:
+            是否允许本次输入
+        """
+        return _PORT_RE.match(proposed) is not None
+    
     def toggle_password_visibility(self):
         """切换密码的可见性"""
         if self.show_password_var.get():
@@ -163,16 +181,15 @@ class EmailTab(ttk.Frame):
         # 显示发送中对话框
         self.app.update_status("正在发送测试邮件...")
         
-        # 在新线程中发送邮件
-        import threading
-        
+        # 在后台线程池中发送邮件
         def send_email_thread():
             success = email_sender.send_email(subject, body)
+            email_sender.close()
             
             # 在主线程中更新UI
             self.after(0, lambda: self._handle_email_result(success))
         
-        threading.Thread(target=send_email_thread, daemon=True).start()
+        self.app.worker_pool.submit(send_email_thread)
     
     def _handle_email_result(self, success: bool):
         """
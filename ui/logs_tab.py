@@ -84,6 +84,7 @@ class LogsTab(ttk.Frame):
         """保存日志到文件"""
         from tkinter import filedialog
         import os
+        from utils.file_utils import write_bytes_file
         
         # 获取保存路径
         file_path = filedialog.asksaveasfilename(
@@ -95,12 +96,8 @@ class LogsTab(ttk.Frame):
         
         if file_path:
             try:
-                # 获取日志内容
-                log_content = self.log_text.get(1.0, tk.END)
-                
-                # 保存到文件
-                with open(file_path, "w", encoding="utf-8") as f:
-                    f.write(log_content)
+                # 获取日志内容，一次性编码为字节后写入
+                write_bytes_file(file_path, self.log_text.get(1.0, tk.END).encode("utf-8"))
                 
                 # 更新状态栏
                 self.app.update_status(f"日志已保存到: {file_path}")
@@ -2,9 +2,33 @@
 """
 主页标签页模块，实现主要配置界面。
 """
+import functools
 import tkinter as tk
 from tkinter import ttk, filedialog
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Sequence
+
+from config.config_manager import Scenario
+
+# 场景列表框的行格式：名称 - 输入/输出/并发/请求数
+_ROW_FMT = "{} - {}/{}/{}/{}".format
+
+
+@functools.lru_cache(maxsize=1024, typed=True)
+def _format_row(name: str, input_len: int, output_len: int, concurrency: int, num_prompts: int) -> str:
+    """
+    格式化场景列表框中的一行
+    
+    Args:
+        name: 场景名称
+        input_len: 输入长度
+        output_len: 输出长度
+        concurrency: 并发数
+        num_prompts: 请求数
+        
+    Returns:
+        显示文本
+    """
+    return _ROW_FMT(name or '未命名场景', input_len, output_len, concurrency, num_prompts)
 
 
 class MainTab(ttk.Frame):
@@ -21,6 +45,9 @@ class MainTab(ttk.Frame):
         super().__init__(parent)
         self.app = app
         
+        # 列表框中当前已渲染的行，用于增量刷新
+        self._rendered_rows: List[str] = []
+        
         # 创建布局
         self.create_widgets()
         
@@ -92,9 +119,9 @@ class MainTab(ttk.Frame):
         self.scenario_listbox.grid(row=1, column=0, columnspan=2, sticky=tk.W+tk.E, pady=2)
         
         # 场景列表滚动条
-        scenario_scrollbar = ttk.Scrollbar(right_frame, orient=tk.VERTICAL, command=self.scenario_listbox.yview)
-        scenario_scrollbar.grid(row=1, column=2, sticky=tk.N+tk.S)
-        self.scenario_listbox.config(yscrollcommand=scenario_scrollbar.set)
+        self.scenario_scrollbar = ttk.Scrollbar(right_frame, orient=tk.VERTICAL, command=self.scenario_listbox.yview)
+        self.scenario_scrollbar.grid(row=1, column=2, sticky=tk.N+tk.S)
+        self.scenario_listbox.config(yscrollcommand=self.scenario_scrollbar.set)
         
         # 选择全部/取消全部按钮
         button_frame = ttk.Frame(right_frame)
@@ -151,17 +178,64 @@ class MainTab(ttk.Frame):
     
     def load_scenarios(self):
         """加载测试场景到列表框"""
-        self.scenario_listbox.delete(0, tk.END)
-        scenarios = self.app.config_manager.scenarios.get_scenarios()
-        for scenario in scenarios:
-            name = scenario.get("name", "未命名场景")
-            input_len = scenario.get("input_len", 0)
-            output_len = scenario.get("output_len", 0)
-            concurrency = scenario.get("concurrency", 0)
-            num_prompts = scenario.get("num_prompts", 0)
-            range_ratio = scenario.get("range_ratio", 1.0)
-            prefix_len = scenario.get("prefix_len", 0)
-            self.scenario_listbox.insert(tk.END, f"{name} - {input_len}/{output_len}/{concurrency}/{num_prompts}")
+        # 按列取出显示所需的字段，逐行打包后格式化
+        names, input_lens, output_lens, concurrencies, num_prompts = \
+            self.app.config_manager.scenarios.columns()[:5]
+        new_rows = [_format_row(*t) for t in zip(names, input_lens, output_lens, concurrencies, num_prompts)]
+        old_rows = self._rendered_rows
+        listbox = self.scenario_listbox
+        
+        # 批量更新期间暂停滚动条回调，只替换内容发生变化的行
+        listbox.config(yscrollcommand="")
+        delete = listbox.delete
+        insert = listbox.insert
+        for i, (old, new) in enumerate(zip(old_rows, new_rows)):
+            if old != new:
+                delete(i)
+                insert(i, new)
+        if len(new_rows) < len(old_rows):
+            listbox.delete(len(new_rows), tk.END)
+        elif len(new_rows) > len(old_rows):
+            listbox.insert(tk.END, *new_rows[len(old_rows):])
+        self._rendered_rows = new_rows
+        listbox.config(yscrollcommand=self.scenario_scrollbar.set)
+        self.scenario_scrollbar.set(*self.scenario_listbox.yview())
+    
+    def _apply_add(self, scenario: Scenario):
+        """
+        在列表框末尾追加一个场景
+        
+        Args:
+            scenario: 新增的测试场景记录
+        """
+        row = _format_row(*scenario[:5])
+        self.scenario_listbox.insert(tk.END, row)
+        self._rendered_rows.append(row)
+    
+    def _apply_update(self, index: int, scenario: Scenario):
+        """
+        替换列表框中的一行，内容未变化时不做任何操作
+        
+        Args:
+            index: 场景索引
+            scenario: 更新后的测试场景记录
+        """
+        row = _format_row(*scenario[:5])
+        if row != self._rendered_rows[index]:
+            self.scenario_listbox.delete(index)
+            self.scenario_listbox.insert(index, row)
+            self._rendered_rows[index] = row
+    
+    def _apply_delete(self, indices: Sequence[int]):
+        """
+        删除列表框中的多行
+        
+        Args:
+            indices: 场景索引，按从大到小排列
+        """
+        for index in indices:
+            self.scenario_listbox.delete(index)
+            del self._rendered_rows[index]
     
     def get_config(self) -> Dict[str, Any]:
         """
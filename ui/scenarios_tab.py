@@ -2,21 +2,60 @@
 """
 测试场景标签页模块，实现测试场景管理界面。
 """
+import re
 import tkinter as tk
 from tkinter import ttk, messagebox
-from typing import Dict, List, Any
-import traceback
+from typing import Dict, List, Any, Sequence
 
+# 表单数值字段及其默认值
+_NUMERIC_FIELDS = {
+    "input_len": 50,
+    "output_len": 1024,
+    "concurrency": 4,
+    "num_prompts": 20,
+    "range_ratio": 1.0,
+    "prefix_len": 0,
+}
 
-def show_error_dialog(error_msg):
-    """显示错误对话框"""
-    import tkinter as tk
-    from tkinter import messagebox
+# 数值输入校验（允许空串等输入过程中的中间状态）
+_INT_INPUT_RE = re.compile(r'^-?\d*$')
+_FLOAT_INPUT_RE = re.compile(r'^\d*\.?\d*$')
+
+# 批量显示树视图行的Tcl脚本：先复用空闲条目，再以指定ID插入新条目。
+# 参数以Tcl列表传入，无需手工转义，整批操作只需一次Python到Tcl的调用
+_SHOW_ROWS_SCRIPT = """{tree reused created rows} {
+    set i 0
+    foreach id $reused {
+        $tree move $id {} end
+        $tree item $id -values [lindex $rows $i]
+        incr i
+    }
+    foreach id $created {
+        $tree insert {} end -id $id -values [lindex $rows $i]
+        incr i
+    }
+}"""
+
+
+def show_error_dialog(error_msg, parent=None):
+    """
+    显示错误对话框，复用已有的根窗口
     
-    root = tk.Tk()
-    root.withdraw()  # 隐藏主窗口
-    messagebox.showerror("错误", error_msg)
-    root.destroy()
+    Args:
+        error_msg: 错误消息
+        parent: 对话框的父窗口
+    """
+    # 仅在没有任何根窗口（模块被单独使用）时才临时创建一个
+    if parent is None and tk._default_root is None:
+        root = tk.Tk()
+        root.withdraw()
+        try:
+            messagebox.showerror("错误", error_msg, parent=root)
+        finally:
+            root.destroy()
+        return
+    
+    messagebox.showerror("错误", error_msg, parent=parent)
 
 
 class ScenariosTab(ttk.Frame):
@@ -34,6 +73,36 @@ class ScenariosTab(ttk.Frame):
         self.app = app
         self.selected_index = None
         
+        # 树视图中当前已渲染的行及其条目ID，两者一一对应，用于增量刷新
+        self._rendered_rows: List[tuple] = []
+        self._row_ids: List[str] = []
+        
+        # 已分离（隐藏）的空闲条目，行数增加时优先复用
+        self._free_ids: List[str] = []
+        
+        # 新建条目ID的序号
+        self._next_row_id = 0
+        
+        # 待执行的选择处理回调，用于合并连续的选择事件
+        self._select_after_id = None
+        
+        # 待执行的保存回调，用于合并连续按下的保存快捷键
+        self._save_after_id = None
+        
+        # 已通过输入校验的表单数值，None表示当前输入不完整
+        self._form_cache: Dict[str, Any] = dict(_NUMERIC_FIELDS)
+        
+        # 界面元素在标签页首次显示时才创建
+        self._built = False
+    
+    def _ensure_built(self):
+        """确保界面元素已创建"""
+        if not self._built:
+            self._built = True
+            self._build()
+    
+    def _build(self):
+        """创建界面元素并加载场景"""
         # 创建布局
         self.create_widgets()
         
@@ -41,7 +110,7 @@ class ScenariosTab(ttk.Frame):
         self.bind_shortcuts()
         
         # 加载配置
-        self.load_config(self.app.config_manager.scenarios.get_scenarios())
+        self.load_config(self.app.config_manager.scenarios.get_display_rows())
     
     def create_widgets(self):
         """创建界面元素"""
@@ -57,7 +126,10 @@ class ScenariosTab(ttk.Frame):
         
         # 使用Treeview创建表格
         columns = ("name", "input_len", "output_len", "concurrency", "num_prompts", "range_ratio", "prefix_len")
-        self.scenario_tree = ttk.Treeview(list_frame, columns=columns, show="headings", height=20)
+        # 固定行高，插入行时无需按内容重新测量
+        ttk.Style(self).configure("Fixed.Treeview", rowheight=20)
+        self.scenario_tree = ttk.Treeview(list_frame, columns=columns, show="headings", height=20,
+                                          selectmode="extended", style="Fixed.Treeview")
         
         # 定义列头
         self.scenario_tree.heading("name", text="场景名称")
@@ -68,22 +140,22 @@ class ScenariosTab(ttk.Frame):
         self.scenario_tree.heading("range_ratio", text="范围比率")
         self.scenario_tree.heading("prefix_len", text="前缀长度")
         
-        # 设置列宽
-        self.scenario_tree.column("name", width=100, anchor="w")
-        self.scenario_tree.column("input_len", width=60, anchor="center")
-        self.scenario_tree.column("output_len", width=60, anchor="center")
-        self.scenario_tree.column("concurrency", width=50, anchor="center")
-        self.scenario_tree.column("num_prompts", width=50, anchor="center")
-        self.scenario_tree.column("range_ratio", width=60, anchor="center")
-        self.scenario_tree.column("prefix_len", width=60, anchor="center")
+        # 设置固定列宽，内容变化时不重新分配列宽
+        self.scenario_tree.column("name", width=100, anchor="w", stretch=False)
+        self.scenario_tree.column("input_len", width=60, anchor="center", stretch=False)
+        self.scenario_tree.column("output_len", width=60, anchor="center", stretch=False)
+        self.scenario_tree.column("concurrency", width=50, anchor="center", stretch=False)
+        self.scenario_tree.column("num_prompts", width=50, anchor="center", stretch=False)
+        self.scenario_tree.column("range_ratio", width=60, anchor="center", stretch=False)
+        self.scenario_tree.column("prefix_len", width=60, anchor="center", stretch=False)
         
         # 添加滚动条
-        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.scenario_tree.yview)
-        self.scenario_tree.configure(yscrollcommand=scrollbar.set)
+        self._scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.scenario_tree.yview)
+        self.scenario_tree.configure(yscrollcommand=self._scrollbar.set)
         
         # 布局
         self.scenario_tree.grid(row=0, column=0, sticky="nsew")
-        scrollbar.grid(row=0, column=1, sticky="ns")
+        self._scrollbar.grid(row=0, column=1, sticky="ns")
         
         # 绑定选择事件
         self.scenario_tree.bind("<<TreeviewSelect>>", self.on_scenario_select)
@@ -126,58 +198,72 @@ class ScenariosTab(ttk.Frame):
         # 右侧 - 场景编辑
         ttk.Label(self, text="场景编辑", font=("Arial", 12, "bold")).grid(row=0, column=1, sticky=tk.W, pady=5, columnspan=2)
         
-        # 场景名称
-        ttk.Label(self, text="场景名称:").grid(row=1, column=1, sticky=tk.W, pady=2)
+        # 表单变量
         self.name_var = tk.StringVar()
-        ttk.Entry(self, textvariable=self.name_var, width=30).grid(row=1, column=2, sticky=tk.W, pady=2)
-        
-        # 输入长度
-        ttk.Label(self, text="输入长度:").grid(row=2, column=1, sticky=tk.W, pady=2)
         self.input_len_var = tk.IntVar(value=50)
-        ttk.Entry(self, textvariable=self.input_len_var, width=10).grid(row=2, column=2, sticky=tk.W, pady=2)
-        
-        # 输出长度
-        ttk.Label(self, text="输出长度:").grid(row=3, column=1, sticky=tk.W, pady=2)
         self.output_len_var = tk.IntVar(value=1024)
-        ttk.Entry(self, textvariable=self.output_len_var, width=10).grid(row=3, column=2, sticky=tk.W, pady=2)
-        
-        # 并发数
-        ttk.Label(self, text="并发数:").grid(row=4, column=1, sticky=tk.W, pady=2)
         self.concurrency_var = tk.IntVar(value=4)
-        ttk.Entry(self, textvariable=self.concurrency_var, width=10).grid(row=4, column=2, sticky=tk.W, pady=2)
-        
-        # 请求数
-        ttk.Label(self, text="请求数:").grid(row=5, column=1, sticky=tk.W, pady=2)
         self.num_prompts_var = tk.IntVar(value=20)
-        ttk.Entry(self, textvariable=self.num_prompts_var, width=10).grid(row=5, column=2, sticky=tk.W, pady=2)
-        
-        # 范围比率
-        ttk.Label(self, text="范围比率:").grid(row=6, column=1, sticky=tk.W, pady=2)
         self.range_ratio_var = tk.DoubleVar(value=1.0)
-        ttk.Entry(self, textvariable=self.range_ratio_var, width=10).grid(row=6, column=2, sticky=tk.W, pady=2)
-        
-        # 前缀长度
-        ttk.Label(self, text="前缀长度:").grid(row=7, column=1, sticky=tk.W, pady=2)
         self.prefix_len_var = tk.IntVar(value=0)
-        ttk.Entry(self, textvariable=self.prefix_len_var, width=10).grid(row=7, column=2, sticky=tk.W, pady=2)
+        self._numeric_vars = {
+            "input_len": self.input_len_var,
+            "output_len": self.output_len_var,
+            "concurrency": self.concurrency_var,
+            "num_prompts": self.num_prompts_var,
+            "range_ratio": self.range_ratio_var,
+            "prefix_len": self.prefix_len_var,
+        }
+        
+        # 表单字段：(标签, 字段名, 变量, 输入框宽度)
+        fields = [
+            ("场景名称", "name", self.name_var, 30),
+            ("输入长度", "input_len", self.input_len_var, 10),
+            ("输出长度", "output_len", self.output_len_var, 10),
+            ("并发数", "concurrency", self.concurrency_var, 10),
+            ("请求数", "num_prompts", self.num_prompts_var, 10),
+            ("范围比率", "range_ratio", self.range_ratio_var, 10),
+            ("前缀长度", "prefix_len", self.prefix_len_var, 10),
+        ]
+        for row, (label, key, var, width) in enumerate(fields, start=1):
+            ttk.Label(self, text=f"{label}:").grid(row=row, column=1, sticky=tk.W, pady=2)
+            entry = ttk.Entry(self, textvariable=var, width=width)
+            entry.grid(row=row, column=2, sticky=tk.W, pady=2)
+            
+            # 数值字段在输入时校验，并缓存校验后的值
+            if key in _NUMERIC_FIELDS:
+                validator = self._validate_float if key == "range_ratio" else self._validate_int
+                vcmd = (self.register(lambda proposed, key=key, validator=validator: validator(key, proposed)), '%P')
+                entry.configure(validate='key', validatecommand=vcmd)
         
         # 说明
         ttk.Label(self, text="说明:", font=("Arial", 10, "bold")).grid(row=8, column=1, sticky=tk.W, pady=5)
-        ttk.Label(self, text="1. 输入长度: 每个请求的输入词元数").grid(row=9, column=1, columnspan=2, sticky=tk.W)
-        ttk.Label(self, text="2. 输出长度: 每个请求的输出词元数").grid(row=10, column=1, columnspan=2, sticky=tk.W)
-        ttk.Label(self, text="3. 并发数: 最大并发请求数").grid(row=11, column=1, columnspan=2, sticky=tk.W)
-        ttk.Label(self, text="4. 请求数: 要处理的提示数量").grid(row=12, column=1, columnspan=2, sticky=tk.W)
-        ttk.Label(self, text="5. 范围比率: 输入/输出长度的采样比例范围").grid(row=13, column=1, columnspan=2, sticky=tk.W)
-        ttk.Label(self, text="6. 前缀长度: 随机上下文前的固定前缀词元数").grid(row=14, column=1, columnspan=2, sticky=tk.W)
+        explanations = (
+            "1. 输入长度: 每个请求的输入词元数\n"
+            "2. 输出长度: 每个请求的输出词元数\n"
+            "3. 并发数: 最大并发请求数\n"
+            "4. 请求数: 要处理的提示数量\n"
+            "5. 范围比率: 输入/输出长度的采样比例范围\n"
+            "6. 前缀长度: 随机上下文前的固定前缀词元数"
+        )
+        ttk.Label(self, text=explanations, justify=tk.LEFT).grid(row=9, column=1, columnspan=2, sticky=tk.W)
     
     def bind_shortcuts(self):
         """绑定快捷键"""
-        # 在顶层窗口中绑定快捷键，确保在场景标签页激活时有效
-        self.app.bind('<Control-n>', lambda e: self.add_scenario())
-        self.app.bind('<Control-e>', lambda e: self.edit_scenario())
-        self.app.bind('<Control-d>', lambda e: self.delete_scenario())
-        self.app.bind('<Control-s>', lambda e: self.save_config())
-        self.app.bind('<Control-a>', lambda e: self.select_all_scenarios())
+        # 快捷键绑定到本标签页专用的绑定标签上，只在焦点位于本标签页内时生效
+        tag = f"ScenariosShortcuts{id(self)}"
+        self.bind_class(tag, '<Control-n>', lambda e: self.add_scenario())
+        self.bind_class(tag, '<Control-e>', lambda e: self.edit_scenario())
+        self.bind_class(tag, '<Control-d>', lambda e: self.delete_scenario())
+        self.bind_class(tag, '<Control-s>', lambda e: self._schedule_save())
+        pending = [self]
+        while pending:
+            widget = pending.pop()
+            widget.bindtags((tag,) + widget.bindtags())
+            pending.extend(widget.winfo_children())
+        
+        # 全选只绑定在树视图上，避免在输入框中按Ctrl+A时触发
+        self.scenario_tree.bind('<Control-a>', lambda e: (self.select_all_scenarios(), "break")[1])
         
         # 为每个按钮添加快捷键提示
         self.add_button.config(text="添加场景 (Ctrl+N)")
@@ -186,28 +272,115 @@ class ScenariosTab(ttk.Frame):
         self.save_button.config(text="保存配置 (Ctrl+S)")
         self.select_all_button.config(text="全选 (Ctrl+A)")
     
-    def load_config(self, scenarios: List[Dict[str, Any]]):
+    def load_config(self, rows: Sequence[tuple]):
         """
         加载测试场景配置
         
         Args:
-            scenarios: 测试场景列表
+            rows: 各测试场景的显示行
         """
-        # 清空树视图
-        for item in self.scenario_tree.get_children():
-            self.scenario_tree.delete(item)
-        
-        # 添加场景到树视图
-        for i, scenario in enumerate(scenarios):
-            name = scenario.get("name", f"场景{i+1}")
-            input_len = scenario.get("input_len", 50)
-            output_len = scenario.get("output_len", 1024)
-            concurrency = scenario.get("concurrency", 4)
-            num_prompts = scenario.get("num_prompts", 20)
-            range_ratio = scenario.get("range_ratio", 1.0)
-            prefix_len = scenario.get("prefix_len", 0)
+        # 尚未显示过的标签页在构建时再加载
+        if not self._built:
+            return
+        
+        # 复制一份，之后的增量更新会原地修改已渲染行列表
+        new_rows = list(rows)
+        row_ids = self._row_ids
+        
+        # 批量更新期间冻结树视图：暂停滚动条回调并隐藏数据列，避免逐行重新计算布局
+        self.scenario_tree.configure(yscrollcommand="", displaycolumns=())
+        try:
+            # 原地更新内容发生变化的行，不重建行
+            set_item = self.scenario_tree.item
+            for item, old, new in zip(row_ids, self._rendered_rows, new_rows):
+                if old != new:
+                    set_item(item, values=new)
+            
+            # 处理行数变化：多余的行分离回空闲池，不足的行优先从空闲池取用
+            if len(new_rows) < len(row_ids):
+                self._release_rows(len(new_rows))
+            else:
+                self._acquire_rows(new_rows[len(row_ids):])
             
-            self.scenario_tree.insert("", "end", values=(name, input_len, output_len, concurrency, num_prompts, range_ratio, prefix_len))
+            self._rendered_rows = new_rows
+        finally:
+            self.scenario_tree.configure(yscrollcommand=self._scrollbar.set, displaycolumns="#all")
+            self._scrollbar.set(*self.scenario_tree.yview())
+    
+    def _apply_add(self, values: tuple):
+        """
+        在树视图末尾追加一个场景
+        
+        Args:
+            values: 新增场景的显示行
+        """
+        self._acquire_rows([values])
+        self._rendered_rows.append(values)
+    
+    def _apply_update(self, index: int, values: tuple):
+        """
+        更新树视图中的一行，内容未变化时不做任何操作
+        
+        Args:
+            index: 场景索引
+            values: 更新后场景的显示行
+        """
+        if values != self._rendered_rows[index]:
+            self.scenario_tree.item(self._row_ids[index], values=values)
+            self._rendered_rows[index] = values
+    
+    def _apply_delete(self, indices: Sequence[int]):
+        """
+        删除树视图中的多行
+        
+        Args:
+            indices: 场景索引，按从大到小排列
+        """
+        for index in indices:
+            item = self._row_ids.pop(index)
+            self.scenario_tree.selection_remove(item)
+            self.scenario_tree.detach(item)
+            self._free_ids.append(item)
+            del self._rendered_rows[index]
+        
+        # 未命名场景按序号显示，其后的行可能需要重新编号
+        rows = self.app.config_manager.scenarios.get_display_rows()
+        for i in range(min(indices), len(rows)):
+            self._apply_update(i, rows[i])
+    
+    def _acquire_rows(self, rows: List[tuple]):
+        """
+        在树视图末尾批量显示多行，优先复用空闲条目
+        
+        Args:
+            rows: 每行各列的显示值
+        """
+        if not rows:
+            return
+        
+        # 从空闲池取出可复用的条目，不足部分分配新ID
+        reuse_count = min(len(rows), len(self._free_ids))
+        reused = self._free_ids[len(self._free_ids) - reuse_count:]
+        del self._free_ids[len(self._free_ids) - reuse_count:]
+        created = [f"row{n}" for n in range(self._next_row_id, self._next_row_id + len(rows) - reuse_count)]
+        self._next_row_id += len(created)
+        
+        self.tk.call("apply", _SHOW_ROWS_SCRIPT, self.scenario_tree, tuple(reused), tuple(created), tuple(rows))
+        self._row_ids.extend(reused)
+        self._row_ids.extend(created)
+    
+    def _release_rows(self, start: int):
+        """
+        将从指定位置开始的所有行分离到空闲池
+        
+        Args:
+            start: 起始行索引
+        """
+        items = self._row_ids[start:]
+        self.scenario_tree.selection_remove(items)
+        self.scenario_tree.detach(*items)
+        self._free_ids.extend(items)
+        del self._row_ids[start:]
     
     def on_scenario_select(self, event):
         """
@@ -216,6 +389,15 @@ class ScenariosTab(ttk.Frame):
         Args:
             event: 事件对象
         """
+        # 按住方向键浏览时选择事件会连续触发，只处理停顿后的最后一次
+        if self._select_after_id:
+            self.after_cancel(self._select_after_id)
+        self._select_after_id = self.after(50, self._apply_selection)
+    
+    def _apply_selection(self):
+        """根据当前选中项更新按钮状态和表单"""
+        self._select_after_id = None
+        
         selected_items = self.scenario_tree.selection()
         if not selected_items:
             # 如果没有选中项，禁用编辑和删除按钮
@@ -229,22 +411,51 @@ class ScenariosTab(ttk.Frame):
         
         # 获取选中项在列表中的索引
         selected_item = selected_items[0]
-        all_items = self.scenario_tree.get_children()
-        self.selected_index = all_items.index(selected_item)
+        self.selected_index = self._row_ids.index(selected_item)
         
         # 获取场景数据
-        scenarios = self.app.config_manager.scenarios.get_scenarios()
+        scenarios = self.app.config_manager.scenarios.get_records()
         if self.selected_index < len(scenarios):
             scenario = scenarios[self.selected_index]
             
-            # 更新表单
-            self.name_var.set(scenario.get("name", f"场景{self.selected_index+1}"))
-            self.input_len_var.set(scenario.get("input_len", 50))
-            self.output_len_var.set(scenario.get("output_len", 1024))
-            self.concurrency_var.set(scenario.get("concurrency", 4))
-            self.num_prompts_var.set(scenario.get("num_prompts", 20))
-            self.range_ratio_var.set(scenario.get("range_ratio", 1.0))
-            self.prefix_len_var.set(scenario.get("prefix_len", 0))
+            # 更新表单及数值缓存（程序设置变量不会触发输入校验）
+            self.name_var.set(scenario.name or f"场景{self.selected_index+1}")
+            for key in _NUMERIC_FIELDS:
+                value = getattr(scenario, key)
+                self._numeric_vars[key].set(value)
+                self._form_cache[key] = value
+    
+    def _validate_int(self, key: str, proposed: str) -> bool:
+        """
+        校验整数输入，通过时更新数值缓存
+        
+        Args:
+            key: 字段名
+            proposed: 输入后的文本
+            
+        Returns:
+            是否允许本次输入
+        """
+        if _INT_INPUT_RE.match(proposed) is None:
+            return False
+        self._form_cache[key] = int(proposed) if proposed not in ("", "-") else None
+        return True
+    
+    def _validate_float(self, key: str, proposed: str) -> bool:
+        """
+        校验小数输入，通过时更新数值缓存
+        
+        Args:
+            key: 字段名
+            proposed: 输入后的文本
+            
+        Returns:
+            是否允许本次输入
+        """
+        if _FLOAT_INPUT_RE.match(proposed) is None:
+            return False
+        self._form_cache[key] = float(proposed) if proposed not in ("", ".") else None
+        return True
     
     def get_form_data(self) -> Dict[str, Any]:
         """
@@ -253,19 +464,14 @@ class ScenariosTab(ttk.Frame):
         Returns:
             表单数据字典
         """
-        try:
-            return {
-                "name": self.name_var.get() or f"场景{len(self.app.config_manager.scenarios.get_scenarios())+1}",
-                "input_len": self.input_len_var.get(),
-                "output_len": self.output_len_var.get(),
-                "concurrency": self.concurrency_var.get(),
-                "num_prompts": self.num_prompts_var.get(),
-                "range_ratio": self.range_ratio_var.get(),
-                "prefix_len": self.prefix_len_var.get()
-            }
-        except tk.TclError:
-            messagebox.showerror("错误", "请输入有效的数值")
+        if None in self._form_cache.values():
+            show_error_dialog("请输入有效的数值", self)
             return None
+        
+        return {
+            "name": self.name_var.get() or f"场景{len(self.app.config_manager.scenarios.get_scenarios())+1}",
+            **self._form_cache
+        }
     
     def add_scenario(self):
         """添加测试场景"""
@@ -277,11 +483,10 @@ class ScenariosTab(ttk.Frame):
         # 添加场景
         self.app.config_manager.scenarios.add_scenario(scenario)
         
-        # 更新列表
-        self.load_config(self.app.config_manager.scenarios.get_scenarios())
-        
-        # 更新主标签页的场景列表
-        self.app.main_tab.load_scenarios()
+        # 只追加新增的一行
+        scenario_config = self.app.config_manager.scenarios
+        self._apply_add(scenario_config.get_display_rows()[-1])
+        self.app.main_tab._apply_add(scenario_config.get_records()[-1])
         
         # 更新状态栏
         self.app.update_status(f"已添加测试场景: {scenario['name']}")
@@ -289,7 +494,7 @@ class ScenariosTab(ttk.Frame):
     def edit_scenario(self):
         """编辑测试场景"""
         if self.selected_index is None:
-            messagebox.showerror("错误", "请选择要编辑的测试场景")
+            show_error_dialog("请选择要编辑的测试场景", self)
             return
         
         # 获取表单数据
@@ -297,48 +502,55 @@ class ScenariosTab(ttk.Frame):
         if not scenario:
             return
         
+        # 内容未变化时不写配置文件，也不刷新列表
+        if self._is_unchanged(scenario):
+            self.app.update_status(f"测试场景未修改: {scenario['name']}")
+            return
+        
         # 更新场景
         if self.app.config_manager.scenarios.update_scenario(self.selected_index, scenario):
-            # 更新列表
-            self.load_config(self.app.config_manager.scenarios.get_scenarios())
-            
-            # 更新主标签页的场景列表
-            self.app.main_tab.load_scenarios()
+            # 只更新修改的一行
+            scenario_config = self.app.config_manager.scenarios
+            self._apply_update(self.selected_index, scenario_config.get_display_rows()[self.selected_index])
+            self.app.main_tab._apply_update(self.selected_index, scenario_config.get_records()[self.selected_index])
             
             # 更新状态栏
             self.app.update_status(f"已更新测试场景: {scenario['name']}")
         else:
-            messagebox.showerror("错误", "更新测试场景失败")
+            show_error_dialog("更新测试场景失败", self)
     
     def delete_scenario(self):
-        """删除测试场景"""
-        if self.selected_index is None:
-            messagebox.showerror("错误", "请选择要删除的测试场景")
+        """删除选中的测试场景，支持多选批量删除"""
+        # 倒序删除，保证前面的索引在删除过程中保持有效
+        indices = sorted((self.scenario_tree.index(item) for item in self.scenario_tree.selection()), reverse=True)
+        if not indices:
+            show_error_dialog("请选择要删除的测试场景", self)
             return
         
-        # 获取场景名称
-        scenarios = self.app.config_manager.scenarios.get_scenarios()
-        if self.selected_index < len(scenarios):
-            scenario = scenarios[self.selected_index]
-            name = scenario.get("name", f"场景{self.selected_index+1}")
-            
-            # 确认删除
-            if messagebox.askyesno("确认", f"确定要删除测试场景 '{name}' 吗？"):
-                # 删除场景
-                if self.app.config_manager.scenarios.delete_scenario(self.selected_index):
-                    # 更新列表
-                    self.load_config(self.app.config_manager.scenarios.get_scenarios())
-                    
-                    # 更新主标签页的场景列表
-                    self.app.main_tab.load_scenarios()
-                    
-                    # 清空选中索引
-                    self.selected_index = None
-                    
-                    # 更新状态栏
-                    self.app.update_status(f"已删除测试场景: {name}")
-                else:
-                    messagebox.showerror("错误", "删除测试场景失败")
+        # 确认删除，多个场景只确认一次
+        if len(indices) == 1:
+            name = self._rendered_rows[indices[0]][0]
+            prompt = f"确定要删除测试场景 '{name}' 吗？"
+        else:
+            prompt = f"确定要删除 {len(indices)} 个测试场景吗？"
+        if not messagebox.askyesno("确认", prompt, parent=self):
+            return
+        
+        # 一次性删除所有选中的场景，配置文件只保存一次
+        if not self.app.config_manager.scenarios.delete_scenarios(indices):
+            show_error_dialog("删除测试场景失败", self)
+            return
+        self._apply_delete(indices)
+        self.app.main_tab._apply_delete(indices)
+        
+        # 清空选中索引
+        self.selected_index = None
+        
+        # 更新状态栏
+        if len(indices) == 1:
+            self.app.update_status(f"已删除测试场景: {name}")
+        else:
+            self.app.update_status(f"已删除 {len(indices)} 个测试场景")
     
     def save_config(self):
         """保存测试场景配置"""
@@ -347,23 +559,52 @@ class ScenariosTab(ttk.Frame):
         if not scenario:
             return
         
+        # 内容未变化时不写配置文件，也不刷新列表
+        if self._is_unchanged(scenario):
+            self.app.update_status(f"测试场景未修改: {scenario['name']}")
+            return
+        
         # 更新场景
         if self.app.config_manager.scenarios.update_scenario(self.selected_index, scenario):
-            # 更新列表
-            self.load_config(self.app.config_manager.scenarios.get_scenarios())
-            
-            # 更新主标签页的场景列表
-            self.app.main_tab.load_scenarios()
+            # 只更新修改的一行
+            scenario_config = self.app.config_manager.scenarios
+            self._apply_update(self.selected_index, scenario_config.get_display_rows()[self.selected_index])
+            self.app.main_tab._apply_update(self.selected_index, scenario_config.get_records()[self.selected_index])
             
             # 更新状态栏
             self.app.update_status(f"已保存测试场景: {scenario['name']}")
         else:
-            messagebox.showerror("错误", "保存测试场景失败")
+            show_error_dialog("保存测试场景失败", self)
+    
+    def _schedule_save(self):
+        """合并连续的保存快捷键，停顿后只保存一次"""
+        if self._save_after_id:
+            self.after_cancel(self._save_after_id)
+        self._save_after_id = self.after(50, self._run_scheduled_save)
+    
+    def _run_scheduled_save(self):
+        """执行延迟的保存"""
+        self._save_after_id = None
+        self.save_config()
+    
+    def _is_unchanged(self, scenario: Dict[str, Any]) -> bool:
+        """
+        判断表单数据与当前选中的场景是否相同
+        
+        Args:
+            scenario: 表单数据
+            
+        Returns:
+            是否未修改
+        """
+        scenarios = self.app.config_manager.scenarios.get_scenarios()
+        index = self.selected_index
+        return index is not None and 0 <= index < len(scenarios) and scenarios[index] == scenario
     
     def select_all_scenarios(self):
         """全选所有场景"""
-        for item in self.scenario_tree.get_children():
-            self.scenario_tree.selection_add(item)
+        # 一次设置全部选中项，只触发一次选择事件
+        self.scenario_tree.selection_set(self._row_ids)
     
     def deselect_all_scenarios(self):
         """全不选所有场景"""
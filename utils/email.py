@@ -3,14 +3,114 @@
 邮件功能模块，用于发送测试结果邮件。
 """
 import os
+import base64
 import smtplib
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from email.mime.base import MIMEBase
+from email.mime.application import MIMEApplication
 from email import encoders
 from typing import Dict, List, Optional, Union
 
 
+# 附件分块读取大小，为57字节（一行base64）的整数倍，保证各块编码结果可直接拼接
+_ATTACHMENT_CHUNK = 57 * 1024
+
+
+def _read_base64(file_path: str) -> str:
+    """
+    分块读取文件并进行base64编码，避免同时持有原始内容和编码结果
+    
+    Args:
+        file_path: 文件路径
+        
+    Returns:
+        base64编码后的文本，每行76个字符
+    """
+    with open(file_path, "rb", buffering=1 << 20) as f:
+        return "".join(base64.encodebytes(chunk).decode("ascii")
+                       for chunk in iter(lambda: f.read(_ATTACHMENT_CHUNK), b""))
+
+
+# 单轮测试结果模板，场景字段缺失时显示None，结果指标缺失时显示0
+_ROUND_TEMPLATE = """场景: 输入={input_len}, 输出={output_len}, 并发={concurrency}, 请求={num_prompts}, 范围={range_ratio}, 前缀={prefix_len}
+执行时间: {duration} 秒
+
+---------------请求统计----------------
+成功请求数: {completed} ({success_rate}%)
+失败请求数: {failed} ({failure_rate}%)
+总请求数: {total_requests}
+
+---------------吞吐量指标----------------
+请求吞吐量: {request_throughput} req/s
+输出词元吞吐量: {output_throughput} tok/s
+每并发输出词元吞吐量: {per_concurrency_output_throughput} tok/s/并发
+总词元吞吐量: {total_token_throughput} tok/s
+每并发总词元吞吐量: {per_concurrency_total_throughput} tok/s/并发
+
+---------------首词延迟 (TTFT)----------------
+平均TTFT (ms): {mean_ttft_ms}
+中位数TTFT (ms): {median_ttft_ms}
+P99 TTFT (ms): {p99_ttft_ms}
+
+-----每词延迟 (TPOT) (不含首词)------
+平均TPOT (ms): {mean_tpot_ms}
+中位数TPOT (ms): {median_tpot_ms}
+P99 TPOT (ms): {p99_tpot_ms}
+
+---------------词间延迟 (ITL)----------------
+平均ITL (ms): {mean_itl_ms}
+中位数ITL (ms): {median_itl_ms}
+P99 ITL (ms): {p99_itl_ms}
+"""
+
+_ROUND_DEFAULTS = {
+    "input_len": None,
+    "output_len": None,
+    "concurrency": None,
+    "num_prompts": None,
+    "range_ratio": None,
+    "prefix_len": None,
+    "completed": 0,
+    "success_rate": 0,
+    "failed": 0,
+    "failure_rate": 0,
+    "total_requests": 0,
+    "request_throughput": 0,
+    "output_throughput": 0,
+    "per_concurrency_output_throughput": 0,
+    "total_token_throughput": 0,
+    "per_concurrency_total_throughput": 0,
+    "mean_ttft_ms": 0,
+    "median_ttft_ms": 0,
+    "p99_ttft_ms": 0,
+    "mean_tpot_ms": 0,
+    "median_tpot_ms": 0,
+    "p99_tpot_ms": 0,
+    "mean_itl_ms": 0,
+    "median_itl_ms": 0,
+    "p99_itl_ms": 0,
+}
+
+
+def _is_stale_connection_error(error: Exception) -> bool:
+    """
+    判断发送失败是否由复用的SMTP连接失效引起（此时可以重新连接后重试）
+    
+    Args:
+        error: 发送时抛出的异常
+        
+    Returns:
+        是否为连接失效错误
+    """
+    if isinstance(error, smtplib.SMTPServerDisconnected):
+        return True
+    if isinstance(error, smtplib.SMTPResponseException):
+        # 421: 服务不可用，服务器即将关闭连接（常见于空闲超时）
+        return error.smtp_code == 421
+    # 套接字或TLS层错误（如ssl.SSLEOFError、ConnectionResetError）
+    return isinstance(error, OSError) and not isinstance(error, smtplib.SMTPException)
+
+
 class EmailSender:
     """邮件发送类，提供邮件发送功能"""
     
@@ -27,6 +127,52 @@ class EmailSender:
                 - smtp_port: SMTP服务器端口
         """
         self.config = config
+        
+        # 收件人列表只需解析一次
+        self._recipients = [r.strip() for r in str(config.get("email_to") or "").split(",") if r.strip()]
+        
+        # 已登录的SMTP连接，多次发送之间复用
+        self._server: Optional[smtplib.SMTP_SSL] = None
+    
+    def _ensure_server(self, smtp_server: str, smtp_port: int, email_from: str, password: str) -> smtplib.SMTP_SSL:
+        """
+        获取已登录的SMTP连接，不存在时新建
+        
+        Args:
+            smtp_server: SMTP服务器地址
+            smtp_port: SMTP服务器端口
+            email_from: 发件人邮箱
+            password: 邮箱密码
+            
+        Returns:
+            SMTP连接
+        """
+        if self._server is not None:
+            # 复用前先探测连接，服务器可能已因空闲超时关闭了会话
+            try:
+                if self._server.noop()[0] != 250:
+                    self.close()
+            except Exception:
+                self.close()
+        
+        if self._server is None:
+            server = smtplib.SMTP_SSL(smtp_server, smtp_port)
+            try:
+                server.login(email_from, password)
+            except Exception:
+                server.close()
+                raise
+            self._server = server
+        return self._server
+    
+    def close(self) -> None:
+        """关闭复用的SMTP连接"""
+        server, self._server = self._server, None
+        if server is not None:
+            try:
+                server.quit()
+            except Exception:
+                server.close()
     
     def send_email(self, subject: str, body: str, attachments: Optional[List[str]] = None) -> bool:
         """
@@ -65,25 +211,30 @@ class EmailSender:
                 for attachment in attachments:
                     if os.path.exists(attachment):
                         try:
-                            with open(attachment, "rb") as f:
-                                part = MIMEBase('application', 'octet-stream')
-                                part.set_payload(f.read())
-                                encoders.encode_base64(part)
-                                filename = os.path.basename(attachment)
-                                part.add_header('Content-Disposition', f'attachment; filename="{filename}"')
-                                msg.attach(part)
-                                print(f"已添加附件: {filename}")
+                            filename = os.path.basename(attachment)
+                            part = MIMEApplication(_read_base64(attachment), _encoder=encoders.encode_noop, Name=filename)
+                            part['Content-Transfer-Encoding'] = 'base64'
+                            part.add_header('Content-Disposition', f'attachment; filename="{filename}"')
+                            msg.attach(part)
+                            print(f"已添加附件: {filename}")
                         except Exception as e:
                             print(f"添加附件时出错: {e}")
             
-            # 连接邮件服务器并发送
-            server = smtplib.SMTP_SSL(smtp_server, smtp_port)
-            server.login(email_from, password)
-            server.sendmail(email_from, email_to.split(','), msg.as_string())
-            server.quit()
+            # 复用已有连接发送；连接可能已因空闲被服务器关闭，此时重新连接并重试一次
+            reused = self._server is not None
+            try:
+                server = self._ensure_server(smtp_server, smtp_port, email_from, password)
+                server.send_message(msg, from_addr=email_from, to_addrs=self._recipients)
+            except Exception as e:
+                if not reused or not _is_stale_connection_error(e):
+                    raise
+                self.close()
+                server = self._ensure_server(smtp_server, smtp_port, email_from, password)
+                server.send_message(msg, from_addr=email_from, to_addrs=self._recipients)
             print(f"邮件已成功发送到 {email_to}")
             return True
         except Exception as e:
+            self.close()
             print(f"邮件发送失败: {e}")
             return False
     
@@ -108,6 +259,21 @@ class EmailSender:
             return False
 
 
+def _format_round(scenario: Dict[str, Union[str, int, float]], results: Dict[str, Union[str, int, float]], duration: int) -> str:
+    """
+    按模板格式化单轮测试的场景和结果，单轮邮件和汇总邮件共用
+    
+    Args:
+        scenario: 测试场景配置
+        results: 测试结果
+        duration: 测试持续时间（秒）
+        
+    Returns:
+        单轮测试结果文本
+    """
+    return _ROUND_TEMPLATE.format_map({**_ROUND_DEFAULTS, **results, **scenario, "duration": duration})
+
+
 def create_round_email_body(scenario: Dict[str, Union[str, int, float]], results: Dict[str, Union[str, int, float]], duration: int, custom_content: str = "") -> str:
     """
     创建单轮测试的邮件正文
@@ -122,36 +288,7 @@ def create_round_email_body(scenario: Dict[str, Union[str, int, float]], results
         邮件正文
     """
     # 拼接自定义内容和测试结果
-    test_content = f"""场景: 输入={scenario.get('input_len')}, 输出={scenario.get('output_len')}, 并发={scenario.get('concurrency')}, 请求={scenario.get('num_prompts')}, 范围={scenario.get('range_ratio')}, 前缀={scenario.get('prefix_len')}
-执行时间: {duration} 秒
-
----------------请求统计----------------
-成功请求数: {results.get('completed', 0)} ({results.get('success_rate', 0)}%)
-失败请求数: {results.get('failed', 0)} ({results.get('failure_rate', 0)}%)
-总请求数: {results.get('total_requests', 0)}
-
----------------吞吐量指标----------------
-请求吞吐量: {results.get('request_throughput', 0)} req/s
-输出词元吞吐量: {results.get('output_throughput', 0)} tok/s
-每并发输出词元吞吐量: {results.get('per_concurrency_output_throughput', 0)} tok/s/并发
-总词元吞吐量: {results.get('total_token_throughput', 0)} tok/s
-每并发总词元吞吐量: {results.get('per_concurrency_total_throughput', 0)} tok/s/并发
-
----------------首词延迟 (TTFT)----------------
-平均TTFT (ms): {results.get('mean_ttft_ms', 0)}
-中位数TTFT (ms): {results.get('median_ttft_ms', 0)}
-P99 TTFT (ms): {results.get('p99_ttft_ms', 0)}
-
------每词延迟 (TPOT) (不含首词)------
-平均TPOT (ms): {results.get('mean_tpot_ms', 0)}
-中位数TPOT (ms): {results.get('median_tpot_ms', 0)}
-P99 TPOT (ms): {results.get('p99_tpot_ms', 0)}
-
----------------词间延迟 (ITL)----------------
-平均ITL (ms): {results.get('mean_itl_ms', 0)}
-中位数ITL (ms): {results.get('median_itl_ms', 0)}
-P99 ITL (ms): {results.get('p99_itl_ms', 0)}
-"""
+    test_content = _format_round(scenario, results, duration)
 
     # 如果有自定义内容，添加到测试结果前面
     if custom_content:
@@ -176,8 +313,8 @@ def create_final_email_body(summary: Dict[str, Union[str, int, float]], scenario
     Returns:
         邮件正文
     """
-    # 基本摘要信息
-    test_content = f"""LLM基准测试结果汇总
+    # 基本摘要信息，各部分先收集到列表中最后一次性拼接
+    parts = [f"""LLM基准测试结果汇总
 
 测试开始时间: {summary.get('start_time', '')}
 测试结束时间: {summary.get('end_time', '')}
@@ -188,11 +325,12 @@ def create_final_email_body(summary: Dict[str, Union[str, int, float]], scenario
 平均每并发输出词元吞吐量: {summary.get('avg_per_concurrency_output_throughput', 0)} tok/s/并发
 平均每并发总词元吞吐量: {summary.get('avg_per_concurrency_token_throughput', 0)} tok/s/并发
 
-"""
+"""]
+    append = parts.append
 
     # 如果有轮次结果，添加所有轮次的详细信息
     if all_round_results and len(all_round_results) > 0:
-        test_content += "\n\n==================== 各轮次详细测试结果 ====================\n\n"
+        append("\n\n==================== 各轮次详细测试结果 ====================\n\n")
         
         for i, round_data in enumerate(all_round_results):
             scenario = round_data.get("scenario", {})
@@ -202,39 +340,10 @@ def create_final_email_body(summary: Dict[str, Union[str, int, float]], scenario
             if not scenario or not results:
                 continue
                 
-            test_content += f"""
-==================== 轮次 {i+1} ====================
-
-场景: 输入={scenario.get('input_len')}, 输出={scenario.get('output_len')}, 并发={scenario.get('concurrency')}, 请求={scenario.get('num_prompts')}, 范围={scenario.get('range_ratio')}, 前缀={scenario.get('prefix_len')}
-执行时间: {duration} 秒
-
----------------请求统计----------------
-成功请求数: {results.get('completed', 0)} ({results.get('success_rate', 0)}%)
-失败请求数: {results.get('failed', 0)} ({results.get('failure_rate', 0)}%)
-总请求数: {results.get('total_requests', 0)}
-
----------------吞吐量指标----------------
-请求吞吐量: {results.get('request_throughput', 0)} req/s
-输出词元吞吐量: {results.get('output_throughput', 0)} tok/s
-每并发输出词元吞吐量: {results.get('per_concurrency_output_throughput', 0)} tok/s/并发
-总词元吞吐量: {results.get('total_token_throughput', 0)} tok/s
-每并发总词元吞吐量: {results.get('per_concurrency_total_throughput', 0)} tok/s/并发
-
----------------首词延迟 (TTFT)----------------
-平均TTFT (ms): {results.get('mean_ttft_ms', 0)}
-中位数TTFT (ms): {results.get('median_ttft_ms', 0)}
-P99 TTFT (ms): {results.get('p99_ttft_ms', 0)}
-
------每词延迟 (TPOT) (不含首词)------
-平均TPOT (ms): {results.get('mean_tpot_ms', 0)}
-中位数TPOT (ms): {results.get('median_tpot_ms', 0)}
-P99 TPOT (ms): {results.get('p99_tpot_ms', 0)}
-
----------------词间延迟 (ITL)----------------
-平均ITL (ms): {results.get('mean_itl_ms', 0)}
-中位数ITL (ms): {results.get('median_itl_ms', 0)}
-P99 ITL (ms): {results.get('p99_itl_ms', 0)}
-"""
+            append(f"\n==================== 轮次 {i+1} ====================\n\n")
+            append(_format_round(scenario, results, duration))
+    
+    test_content = "".join(parts)
 
     # 如果有自定义内容，添加到测试结果前面
     if custom_content:
@@ -6,9 +6,92 @@ import os
 import sys
 import json
 import shutil
+import threading
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
+from utils.system_info import format_system_info_markdown
+
+# 尝试导入orjson，如果不可用则使用标准库json
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# 单轮测试Markdown报告模板，由str.format_map一次性填充
+_ROUND_MD_TEMPLATE = """# 场景 {round_index} 测试结果
+
+**场景**: 输入={input_len}, 输出={output_len}, 并发={concurrency}, 请求={num_prompts}, 范围={range_ratio}, 前缀={prefix_len}
+
+**执行时间**: {duration} 秒
+
+### 请求统计
+
+成功请求数: {completed} ({success_rate}%)
+失败请求数: {failed} ({failure_rate}%)
+总请求数: {total_requests}
+
+### 吞吐量指标
+
+请求吞吐量: {request_throughput} req/s
+输出词元吞吐量: {output_throughput} tok/s
+每并发输出词元吞吐量: {per_concurrency_output_throughput} tok/s/并发
+总词元吞吐量: {total_token_throughput} tok/s
+每并发总词元吞吐量: {per_concurrency_total_throughput} tok/s/并发
+
+### 首词延迟 (TTFT)
+
+平均TTFT (ms): {mean_ttft_ms}
+中位数TTFT (ms): {median_ttft_ms}
+P99 TTFT (ms): {p99_ttft_ms}
+
+### 每词延迟 (TPOT) (不含首词)
+
+平均TPOT (ms): {mean_tpot_ms}
+中位数TPOT (ms): {median_tpot_ms}
+P99 TPOT (ms): {p99_tpot_ms}
+
+### 词间延迟 (ITL)
+
+平均ITL (ms): {mean_itl_ms}
+中位数ITL (ms): {median_itl_ms}
+P99 ITL (ms): {p99_itl_ms}
+"""
+
+# 模板字段的默认值，场景或结果中缺失的字段使用这些值
+_ROUND_MD_DEFAULTS = {
+    "input_len": None,
+    "output_len": None,
+    "concurrency": None,
+    "num_prompts": None,
+    "range_ratio": None,
+    "prefix_len": None,
+    "completed": 0,
+    "success_rate": 0,
+    "failed": 0,
+    "failure_rate": 0,
+    "total_requests": 0,
+    "request_throughput": 0,
+    "output_throughput": 0,
+    "per_concurrency_output_throughput": 0,
+    "total_token_throughput": 0,
+    "per_concurrency_total_throughput": 0,
+    "mean_ttft_ms": 0,
+    "median_ttft_ms": 0,
+    "p99_ttft_ms": 0,
+    "mean_tpot_ms": 0,
+    "median_tpot_ms": 0,
+    "p99_tpot_ms": 0,
+    "mean_itl_ms": 0,
+    "median_itl_ms": 0,
+    "p99_itl_ms": 0,
+}
+
+# 已确认存在的目录，避免每次写文件都重复调用makedirs
+_ensured_dirs = set()
+_ensured_dirs_lock = threading.Lock()
+
 
 def get_resource_path(relative_path: str) -> str:
     """
@@ -41,6 +124,58 @@ def create_log_directory() -> str:
     return log_dir
 
 
+def _ensure_dir(path: str) -> None:
+    """
+    确保目录存在，同一目录只创建一次
+    
+    Args:
+        path: 目录路径，为空时表示当前目录
+    """
+    if not path or path in _ensured_dirs:
+        return
+    with _ensured_dirs_lock:
+        if path not in _ensured_dirs:
+            os.makedirs(path, exist_ok=True)
+            _ensured_dirs.add(path)
+
+
+def write_bytes_file(file_path: str, data: bytes) -> None:
+    """
+    通过原始文件描述符写入整个字节串，绕过文本编码和缓冲层；失败时抛出OSError
+    
+    Args:
+        file_path: 文件路径
+        data: 要写入的数据
+    """
+    fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        written = 0
+        while written < len(view):
+            written += os.write(fd, view[written:])
+    finally:
+        os.close(fd)
+
+
+def _dumps_json(data: Any) -> bytes:
+    """
+    将数据序列化为UTF-8编码的JSON字节串
+    
+    Args:
+        data: 要序列化的数据
+        
+    Returns:
+        JSON字节串
+    """
+    if HAS_ORJSON:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # orjson不支持的类型，回退到标准库
+            pass
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+
 def write_json_file(file_path: str, data: Any) -> bool:
     """
     将数据写入JSON文件
@@ -54,10 +189,10 @@ def write_json_file(file_path: str, data: Any) -> bool:
     """
     try:
         # 确保目录存在
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        _ensure_dir(os.path.dirname(file_path))
         
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        with open(file_path, 'wb') as f:
+            f.write(_dumps_json(data))
         return True
     except Exception as e:
         print(f"写入JSON文件失败: {e}")
@@ -79,8 +214,12 @@ def read_json_file(file_path: str, default: Any = None) -> Any:
         return default
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        # 以二进制方式一次读入整个文件，由解析器直接处理UTF-8字节
+        with open(file_path, 'rb') as f:
+            raw = f.read()
+        if HAS_ORJSON:
+            return orjson.loads(raw)
+        return json.loads(raw)
     except Exception as e:
         print(f"读取JSON文件失败: {e}")
         return default
@@ -99,7 +238,7 @@ def write_text_file(file_path: str, text: str) -> bool:
     """
     try:
         # 确保目录存在
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        _ensure_dir(os.path.dirname(file_path))
         
         with open(file_path, 'w', encoding='utf-8') as f:
             f.write(text)
@@ -124,8 +263,14 @@ def read_text_file(file_path: str, default: str = "") -> str:
         return default
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return f.read()
+        # 一次读入全部字节后统一解码
+        with open(file_path, 'rb') as f:
+            text = f.read().decode('utf-8')
+        
+        # 与文本模式读取一致，统一换行符
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        return text
     except Exception as e:
         print(f"读取文本文件失败: {e}")
         return default
@@ -149,95 +294,85 @@ def create_markdown_summary(log_dir: str, title: str, config: Dict[str, Any], sy
     """
     summary_md = os.path.join(log_dir, "benchmark_summary.md")
     
-    with open(summary_md, "w", encoding="utf-8") as f:
-        f.write(f"# {title}\n\n")
+    # 先在内存中拼接完整文档，最后一次性写入
+    parts = []
+    append = parts.append
+    
+    append(f"# {title}\n\n")
+    
+    # 仅包含基本的生成时间信息
+    append(f"生成时间: {datetime.now()}\n\n")
+    
+    if summary_data:
+        # 使用与汇总邮件相同的格式内容
+        append(f"## 测试结果汇总\n\n")
+        append(f"测试开始时间: {summary_data.get('start_time', '')}\n")
+        append(f"测试结束时间: {summary_data.get('end_time', '')}\n\n")
         
-        # 仅包含基本的生成时间信息
-        f.write(f"生成时间: {datetime.now()}\n\n")
+        scenarios_count = len(all_round_results) if all_round_results else 0
+        failed_count = len(summary_data.get('failed_scenarios', []))
         
-        if summary_data:
-            # 使用与汇总邮件相同的格式内容
-            f.write(f"## 测试结果汇总\n\n")
-            f.write(f"测试开始时间: {summary_data.get('start_time', '')}\n")
-            f.write(f"测试结束时间: {summary_data.get('end_time', '')}\n\n")
-            
-            scenarios_count = len(all_round_results) if all_round_results else 0
-            failed_count = len(summary_data.get('failed_scenarios', []))
-            
-            f.write(f"测试场景数量: {scenarios_count} 成功, {failed_count} 失败\n\n")
-            
-            f.write(f"平均请求成功率: {summary_data.get('avg_success_rate', 0)}%\n")
-            f.write(f"平均每并发输出词元吞吐量: {summary_data.get('avg_per_concurrency_output_throughput', 0)} tok/s/并发\n")
-            f.write(f"平均每并发总词元吞吐量: {summary_data.get('avg_per_concurrency_token_throughput', 0)} tok/s/并发\n\n")
+        append(f"测试场景数量: {scenarios_count} 成功, {failed_count} 失败\n\n")
+        
+        append(f"平均请求成功率: {summary_data.get('avg_success_rate', 0)}%\n")
+        append(f"平均每并发输出词元吞吐量: {summary_data.get('avg_per_concurrency_output_throughput', 0)} tok/s/并发\n")
+        append(f"平均每并发总词元吞吐量: {summary_data.get('avg_per_concurrency_token_throughput', 0)} tok/s/并发\n\n")
+        
+        # 如果有轮次结果，添加所有轮次的详细信息
+        if all_round_results and len(all_round_results) > 0:
+            append("\n## 各轮次详细测试结果\n\n")
             
-            # 如果有轮次结果，添加所有轮次的详细信息
-            if all_round_results and len(all_round_results) > 0:
-                f.write("\n## 各轮次详细测试结果\n\n")
+            for i, round_data in enumerate(all_round_results):
+                scenario = round_data.get("scenario", {})
+                results = round_data.get("results", {})
+                duration = round_data.get("duration", 0)
                 
-                for i, round_data in enumerate(all_round_results):
-                    scenario = round_data.get("scenario", {})
-                    results = round_data.get("results", {})
-                    duration = round_data.get("duration", 0)
-                    
-                    if not scenario or not results:
-                        continue
-                        
-                    f.write(f"### 轮次 {i+1}\n\n")
-                    
-                    f.write(f"**场景:** 输入={scenario.get('input_len')}, 输出={scenario.get('output_len')}, 并发={scenario.get('concurrency')}, 请求={scenario.get('num_prompts')}, 范围={scenario.get('range_ratio')}, 前缀={scenario.get('prefix_len')}\n")
-                    f.write(f"**执行时间:** {duration} 秒\n\n")
-                    
-                    f.write("#### 请求统计\n")
-                    f.write(f"成功请求数: {results.get('completed', 0)} ({results.get('success_rate', 0)}%)\n")
-                    f.write(f"失败请求数: {results.get('failed', 0)} ({results.get('failure_rate', 0)}%)\n")
-                    f.write(f"总请求数: {results.get('total_requests', 0)}\n\n")
-                    
-                    f.write("#### 吞吐量指标\n")
-                    f.write(f"请求吞吐量: {results.get('request_throughput', 0)} req/s\n")
-                    f.write(f"输出词元吞吐量: {results.get('output_throughput', 0)} tok/s\n")
-                    f.write(f"每并发输出词元吞吐量: {results.get('per_concurrency_output_throughput', 0)} tok/s/并发\n")
-                    f.write(f"总词元吞吐量: {results.get('total_token_throughput', 0)} tok/s\n")
-                    f.write(f"每并发总词元吞吐量: {results.get('per_concurrency_total_throughput', 0)} tok/s/并发\n\n")
+                if not scenario or not results:
+                    continue
                     
-                    f.write("#### 首词延迟 (TTFT)\n")
-                    f.write(f"平均TTFT (ms): {results.get('mean_ttft_ms', 0)}\n")
-                    f.write(f"中位数TTFT (ms): {results.get('median_ttft_ms', 0)}\n")
-                    f.write(f"P99 TTFT (ms): {results.get('p99_ttft_ms', 0)}\n\n")
-                    
-                    f.write("#### 每词延迟 (TPOT) (不含首词)\n")
-                    f.write(f"平均TPOT (ms): {results.get('mean_tpot_ms', 0)}\n")
-                    f.write(f"中位数TPOT (ms): {results.get('median_tpot_ms', 0)}\n")
-                    f.write(f"P99 TPOT (ms): {results.get('p99_tpot_ms', 0)}\n\n")
-                    
-                    f.write("#### 词间延迟 (ITL)\n")
-                    f.write(f"平均ITL (ms): {results.get('mean_itl_ms', 0)}\n")
-                    f.write(f"中位数ITL (ms): {results.get('median_itl_ms', 0)}\n")
-                    f.write(f"P99 ITL (ms): {results.get('p99_itl_ms', 0)}\n\n")
-        
-        # 添加基本配置信息
-        f.write("## 测试配置\n\n")
-        f.write(f"- 基础URL: {config.get('base_url', '')}\n")
-        f.write(f"- 模型: {config.get('model', '')}\n")
-        f.write(f"- 分词器: {config.get('tokenizer', '')}\n")
-        f.write(f"- 后端: {config.get('backend', '')}\n\n")
-        
-        # 记录系统信息
-        f.write("## 系统信息\n\n")
-        for key, value in system_info.items():
-            if key != "GPU信息":
-                f.write(f"- **{key}:** {value}\n")
-        
-        # 记录GPU信息
-        f.write("\n### GPU信息\n\n")
-        if isinstance(system_info.get("GPU信息"), list):
-            for gpu in system_info["GPU信息"]:
-                f.write(f"**GPU {gpu['索引']}: {gpu['名称']}**\n")
-                for k, v in gpu.items():
-                    if k != "索引" and k != "名称":
-                        f.write(f"- {k}: {v}\n")
-                f.write("\n")
-        else:
-            f.write(f"{system_info.get('GPU信息', '未知')}\n\n")
+                append(f"### 轮次 {i+1}\n\n")
+                
+                append(f"**场景:** 输入={scenario.get('input_len')}, 输出={scenario.get('output_len')}, 并发={scenario.get('concurrency')}, 请求={scenario.get('num_prompts')}, 范围={scenario.get('range_ratio')}, 前缀={scenario.get('prefix_len')}\n")
+                append(f"**执行时间:** {duration} 秒\n\n")
+                
+                append("#### 请求统计\n")
+                append(f"成功请求数: {results.get('completed', 0)} ({results.get('success_rate', 0)}%)\n")
+                append(f"失败请求数: {results.get('failed', 0)} ({results.get('failure_rate', 0)}%)\n")
+                append(f"总请求数: {results.get('total_requests', 0)}\n\n")
+                
+                append("#### 吞吐量指标\n")
+                append(f"请求吞吐量: {results.get('request_throughput', 0)} req/s\n")
+                append(f"输出词元吞吐量: {results.get('output_throughput', 0)} tok/s\n")
+                append(f"每并发输出词元吞吐量: {results.get('per_concurrency_output_throughput', 0)} tok/s/并发\n")
+                append(f"总词元吞吐量: {results.get('total_token_throughput', 0)} tok/s\n")
+                append(f"每并发总词元吞吐量: {results.get('per_concurrency_total_throughput', 0)} tok/s/并发\n\n")
+                
+                append("#### 首词延迟 (TTFT)\n")
+                append(f"平均TTFT (ms): {results.get('mean_ttft_ms', 0)}\n")
+                append(f"中位数TTFT (ms): {results.get('median_ttft_ms', 0)}\n")
+                append(f"P99 TTFT (ms): {results.get('p99_ttft_ms', 0)}\n\n")
+                
+                append("#### 每词延迟 (TPOT) (不含首词)\n")
+                append(f"平均TPOT (ms): {results.get('mean_tpot_ms', 0)}\n")
+                append(f"中位数TPOT (ms): {results.get('median_tpot_ms', 0)}\n")
+                append(f"P99 TPOT (ms): {results.get('p99_tpot_ms', 0)}\n\n")
+                
+                append("#### 词间延迟 (ITL)\n")
+                append(f"平均ITL (ms): {results.get('mean_itl_ms', 0)}\n")
+                append(f"中位数ITL (ms): {results.get('median_itl_ms', 0)}\n")
+                append(f"P99 ITL (ms): {results.get('p99_itl_ms', 0)}\n\n")
+    
+    # 添加基本配置信息
+    append("## 测试配置\n\n")
+    append(f"- 基础URL: {config.get('base_url', '')}\n")
+    append(f"- 模型: {config.get('model', '')}\n")
+    append(f"- 分词器: {config.get('tokenizer', '')}\n")
+    append(f"- 后端: {config.get('backend', '')}\n\n")
+    
+    # 记录系统信息（含GPU信息）
+    append(format_system_info_markdown(system_info))
+    
+    write_bytes_file(summary_md, "".join(parts).encode("utf-8"))
     
     return summary_md
 
@@ -254,6 +389,9 @@ def append_to_markdown(file_path: str, content: str) -> bool:
         是否追加成功
     """
     try:
+        # 确保目录存在
+        _ensure_dir(os.path.dirname(file_path))
+        
         with open(file_path, 'a', encoding='utf-8') as f:
             f.write(content)
         return True
@@ -278,45 +416,9 @@ def create_round_markdown(log_dir: str, round_index: int, scenario: Dict[str, An
     """
     round_md = os.path.join(log_dir, f"round_{round_index}.md")
     
-    with open(round_md, "w", encoding="utf-8") as f:
-        f.write(f"# 场景 {round_index} 测试结果\n\n")
-        
-        # 场景信息
-        f.write(f"**场景**: 输入={scenario.get('input_len')}, 输出={scenario.get('output_len')}, 并发={scenario.get('concurrency')}, 请求={scenario.get('num_prompts')}, 范围={scenario.get('range_ratio')}, 前缀={scenario.get('prefix_len')}\n\n")
-        
-        # 执行时间
-        f.write(f"**执行时间**: {duration} 秒\n\n")
-        
-        # 请求统计
-        f.write("### 请求统计\n\n")
-        f.write(f"成功请求数: {results.get('completed', 0)} ({results.get('success_rate', 0)}%)\n")
-        f.write(f"失败请求数: {results.get('failed', 0)} ({results.get('failure_rate', 0)}%)\n")
-        f.write(f"总请求数: {results.get('total_requests', 0)}\n\n")
-        
-        # 吞吐量指标
-        f.write("### 吞吐量指标\n\n")
-        f.write(f"请求吞吐量: {results.get('request_throughput', 0)} req/s\n")
-        f.write(f"输出词元吞吐量: {results.get('output_throughput', 0)} tok/s\n")
-        f.write(f"每并发输出词元吞吐量: {results.get('per_concurrency_output_throughput', 0)} tok/s/并发\n")
-        f.write(f"总词元吞吐量: {results.get('total_token_throughput', 0)} tok/s\n")
-        f.write(f"每并发总词元吞吐量: {results.get('per_concurrency_total_throughput', 0)} tok/s/并发\n\n")
-        
-        # TTFT指标
-        f.write("### 首词延迟 (TTFT)\n\n")
-        f.write(f"平均TTFT (ms): {results.get('mean_ttft_ms', 0)}\n")
-        f.write(f"中位数TTFT (ms): {results.get('median_ttft_ms', 0)}\n")
-        f.write(f"P99 TTFT (ms): {results.get('p99_ttft_ms', 0)}\n\n")
-        
-        # TPOT指标
-        f.write("### 每词延迟 (TPOT) (不含首词)\n\n")
-        f.write(f"平均TPOT (ms): {results.get('mean_tpot_ms', 0)}\n")
-        f.write(f"中位数TPOT (ms): {results.get('median_tpot_ms', 0)}\n")
-        f.write(f"P99 TPOT (ms): {results.get('p99_tpot_ms', 0)}\n\n")
-        
-        # ITL指标
-        f.write("### 词间延迟 (ITL)\n\n")
-        f.write(f"平均ITL (ms): {results.get('mean_itl_ms', 0)}\n")
-        f.write(f"中位数ITL (ms): {results.get('median_itl_ms', 0)}\n")
-        f.write(f"P99 ITL (ms): {results.get('p99_itl_ms', 0)}\n")
+    body = _ROUND_MD_TEMPLATE.format_map({**_ROUND_MD_DEFAULTS, **results, **scenario,
+                                          "round_index": round_index, "duration": duration})
+    
+    write_bytes_file(round_md, body.encode("utf-8"))
     
     return round_md 
\ No newline at end of file
@@ -4,9 +4,59 @@
 """
 import os
 import base64
-from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+import functools
+from typing import TYPE_CHECKING
+
+# cryptography导入开销较大，只在实际需要加解密时才导入
+if TYPE_CHECKING:
+    from cryptography.fernet import Fernet
+
+
+@functools.lru_cache(maxsize=None)
+def _load_or_generate_key(key_file: str) -> bytes:
+    """
+    加载或生成密钥，同一密钥文件在进程内只读取一次
+    
+    Args:
+        key_file: 密钥文件路径
+        
+    Returns:
+        密钥
+    """
+    # 确保目录存在
+    os.makedirs(os.path.dirname(key_file), exist_ok=True)
+    
+    if os.path.exists(key_file):
+        with open(key_file, "rb") as f:
+            return f.read()
+    else:
+        # 只有需要生成新密钥时才导入cryptography
+        from cryptography.fernet import Fernet
+        
+        key = Fernet.generate_key()
+        with open(key_file, "wb") as f:
+            f.write(key)
+        return key
+
+
+@functools.lru_cache(maxsize=None)
+def _get_cipher(key: bytes) -> "Fernet":
+    """
+    获取密钥对应的Fernet实例，同一密钥只创建一次；首次实际加解密时才导入cryptography
+    
+    Args:
+        key: 密钥
+        
+    Returns:
+        Fernet实例
+    """
+    from cryptography.fernet import Fernet
+    
+    return Fernet(key)
+
+
+# 预先生成的掩码字符串，掩码时直接切片，超长数据再临时生成
+_MASK_CHARS = "*" * 256
 
 
 class SecureStorage:
@@ -20,22 +70,12 @@ class SecureStorage:
             key_file: 密钥文件路径
         """
         self.key_file = key_file
-        self.key = self._load_or_generate_key()
-        self.cipher = Fernet(self.key)
+        self.key = _load_or_generate_key(key_file)
     
-    def _load_or_generate_key(self) -> bytes:
-        """加载或生成密钥"""
-        # 确保目录存在
-        os.makedirs(os.path.dirname(self.key_file), exist_ok=True)
-        
-        if os.path.exists(self.key_file):
-            with open(self.key_file, "rb") as f:
-                return f.read()
-        else:
-            key = Fernet.generate_key()
-            with open(self.key_file, "wb") as f:
-                f.write(key)
-            return key
+    @property
+    def cipher(self) -> "Fernet":
+        """与密钥对应的共享Fernet实例"""
+        return _get_cipher(self.key)
     
     def encrypt(self, data: str) -> str:
         """
@@ -88,6 +128,9 @@ class PasswordManager:
         if salt is None:
             salt = os.urandom(16)
         
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+        
         kdf = PBKDF2HMAC(
             algorithm=hashes.SHA256(),
             length=32,
@@ -130,7 +173,10 @@ def mask_sensitive_data(data: str, visible_prefix: int = 4, visible_suffix: int
     if not data:
         return ""
     
-    if len(data) <= visible_prefix + visible_suffix:
-        return "*" * len(data)
+    length = len(data)
+    mask = _MASK_CHARS if length <= len(_MASK_CHARS) else "*" * length
+    
+    if length <= visible_prefix + visible_suffix:
+        return mask[:length]
     
-    return data[:visible_prefix] + "*" * (len(data) - visible_prefix - visible_suffix) + data[-visible_suffix:] 
\ No newline at end of file
+    return f"{data[:visible_prefix]}{mask[:length - visible_prefix - visible_suffix]}{data[-visible_suffix:]}" 
\ No newline at end of file
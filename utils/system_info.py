@@ -2,10 +2,13 @@
 """
 系统信息收集模块，用于获取系统和硬件信息。
 """
+import csv
+import functools
+import os
 import platform
 import subprocess
 import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 # 尝试导入psutil，如果不可用则忽略
 try:
@@ -15,6 +18,45 @@ except ImportError:
     HAS_PSUTIL = False
 
 
+# nvidia-smi查询GPU信息的命令
+_NVIDIA_SMI_CMD = ("nvidia-smi --query-gpu=index,name,driver_version,memory.total,utilization.gpu,temperature.gpu "
+                   "--format=csv,noheader")
+# 没有可用GPU信息时显示的提示
+_NO_GPU_MESSAGE = "未检测到NVIDIA GPU或无法访问nvidia-smi"
+# nvidia-smi输出各列对应的字段名，顺序与查询参数一致
+_GPU_INFO_KEYS = ("索引", "名称", "驱动版本", "显存总量", "GPU利用率", "温度")
+
+# Linux下在同一个shell进程中依次执行的信息查询命令，各段输出以分隔行隔开
+_PROBE_SEPARATOR = "----probe-section----"
+_PROBE_FAILED = "----probe-failed----"
+# 有psutil时内存信息直接由psutil获取，不必执行free
+_LINUX_PROBES = (() if HAS_PSUTIL else (("memory", "free -h | grep Mem"),)) + (
+    ("gpu", _NVIDIA_SMI_CMD),
+)
+_LINUX_PROBE_SCRIPT = f"; echo '{_PROBE_SEPARATOR}'; ".join(
+    f"{{ {cmd}; }} 2>/dev/null || echo '{_PROBE_FAILED}'" for _, cmd in _LINUX_PROBES
+)
+
+
+def _probe_linux() -> Dict[str, str]:
+    """
+    在一个shell进程中执行所有Linux系统信息查询命令
+    
+    Returns:
+        各命令的输出，键为查询名称；命令失败的查询不包含在内
+    """
+    try:
+        output = subprocess.run(["sh", "-c", _LINUX_PROBE_SCRIPT], capture_output=True).stdout.decode(errors="replace")
+    except Exception:
+        return {}
+    
+    sections = output.split(f"{_PROBE_SEPARATOR}\n")
+    if len(sections) != len(_LINUX_PROBES):
+        return {}
+    return {name: section for (name, _), section in zip(_LINUX_PROBES, sections)
+            if _PROBE_FAILED not in section}
+
+
 def collect_system_info() -> Dict[str, Any]:
     """
     收集系统信息
@@ -24,26 +66,85 @@ def collect_system_info() -> Dict[str, Any]:
     """
     info = {}
     info["日期"] = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    info["主机名"] = platform.node()
-    info["操作系统"] = platform.platform()
-    info["Python版本"] = platform.python_version()
+    info.update(_collect_static_system_info())
+    
+    # CPU使用率、可用内存和GPU利用率/温度会随时间变化，每次重新获取
+    if HAS_PSUTIL:
+        info["CPU使用率"] = f"{psutil.cpu_percent()}%"
     
-    # 收集CPU信息
-    info.update(collect_cpu_info())
+    # Linux下一次性执行所有查询命令，避免逐条创建子进程
+    probe = _probe_linux() if platform.system() != "Windows" else None
     
     # 收集内存信息
-    info.update(collect_memory_info())
+    info.update(collect_memory_info(probe))
     
     # 收集GPU信息
-    info["GPU信息"] = collect_gpu_info()
+    info["GPU信息"] = collect_gpu_info(probe)
     
     return info
 
 
+@functools.lru_cache(maxsize=1)
+def _collect_static_system_info() -> Dict[str, str]:
+    """
+    收集进程运行期间不变的系统信息（主机、操作系统和CPU型号等），结果只计算一次
+    
+    Returns:
+        包含系统信息的字典
+    """
+    info = {}
+    info["主机名"] = platform.node()
+    info["操作系统"] = platform.platform()
+    info["Python版本"] = platform.python_version()
+    
+    # 收集CPU信息（CPU使用率每次调用时单独获取）
+    info.update(_collect_cpu_static_info())
+    
+    return info
+
+
+def _read_cpuinfo() -> Dict[str, str]:
+    """
+    直接读取/proc/cpuinfo中第一个处理器的型号和每插槽核心数
+    
+    Returns:
+        包含"model name"和"cpu cores"字段的字典，读取失败的字段不包含在内
+    """
+    fields = {}
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                key, sep, value = line.partition(":")
+                key = key.strip()
+                if sep and key in ("model name", "cpu cores") and key not in fields:
+                    fields[key] = value.strip()
+                    if len(fields) == 2:
+                        break
+    except OSError:
+        pass
+    return fields
+
+
 def collect_cpu_info() -> Dict[str, str]:
     """
     收集CPU信息
     
+    Returns:
+        包含CPU信息的字典
+    """
+    info = _collect_cpu_static_info()
+    
+    # 尝试获取CPU使用率
+    if HAS_PSUTIL:
+        info["CPU使用率"] = f"{psutil.cpu_percent()}%"
+    
+    return info
+
+
+def _collect_cpu_static_info() -> Dict[str, str]:
+    """
+    收集不随时间变化的CPU信息（型号和核心数）
+    
     Returns:
         包含CPU信息的字典
     """
@@ -54,41 +155,35 @@ def collect_cpu_info() -> Dict[str, str]:
             info["CPU信息"] = platform.processor()
             info["核心数"] = str(psutil.cpu_count(logical=True))
             info["物理核心数"] = str(psutil.cpu_count(logical=False))
-            info["CPU使用率"] = f"{psutil.cpu_percent()}%"
         else:
             info["CPU信息"] = platform.processor()
             info["核心数"] = "未知（需要安装psutil）"
     else:
-        try:
-            # Linux系统
-            cpu_info = subprocess.check_output("cat /proc/cpuinfo | grep 'model name' | head -1", shell=True).decode()
-            cpu_info = cpu_info.split(':')[1].strip() if ':' in cpu_info else "未知"
-            info["CPU信息"] = cpu_info
-            
-            cores = subprocess.check_output("nproc", shell=True).decode().strip()
-            info["核心数"] = cores
-            
-            # 尝试获取物理核心数
-            try:
-                physical_cores = subprocess.check_output("lscpu | grep 'Core(s) per socket' | awk '{print $4}'", shell=True).decode().strip()
-                info["物理核心数"] = physical_cores
-            except:
-                info["物理核心数"] = "未知"
-            
-            # 尝试获取CPU使用率
-            if HAS_PSUTIL:
-                info["CPU使用率"] = f"{psutil.cpu_percent()}%"
-        except:
+        # Linux系统，直接读取/proc/cpuinfo，无需创建子进程
+        cores = os.cpu_count()
+        if not cores:
             info["CPU信息"] = "无法获取"
             info["核心数"] = "无法获取"
+            return info
+        
+        cpuinfo = _read_cpuinfo()
+        info["CPU信息"] = cpuinfo.get("model name") or "未知"
+        info["核心数"] = str(cores)
+        
+        # 物理核心数
+        physical_cores = psutil.cpu_count(logical=False) if HAS_PSUTIL else None
+        info["物理核心数"] = str(physical_cores) if physical_cores else cpuinfo.get("cpu cores") or "未知"
     
     return info
 
 
-def collect_memory_info() -> Dict[str, str]:
+def collect_memory_info(probe: Optional[Dict[str, str]] = None) -> Dict[str, str]:
     """
     收集内存信息
     
+    Args:
+        probe: Linux下_probe_linux()的结果，为None时自行查询
+        
     Returns:
         包含内存信息的字典
     """
@@ -103,51 +198,48 @@ def collect_memory_info() -> Dict[str, str]:
         if platform.system() == "Windows":
             info["内存总量"] = "未知（需要安装psutil）"
         else:
-            try:
-                # Linux系统
-                mem_info = subprocess.check_output("free -h | grep Mem", shell=True).decode().strip()
-                parts = mem_info.split()
+            # Linux系统
+            if probe is None:
+                probe = _probe_linux()
+            
+            parts = probe.get("memory", "").split()
+            if not parts:
+                info["内存总量"] = "无法获取"
+            else:
                 if len(parts) >= 2:
                     info["内存总量"] = parts[1]
-                if len(parts) >= 4:
+                if len(parts) >= 7:
                     info["可用内存"] = parts[6]  # 'available' column
-            except:
-                info["内存总量"] = "无法获取"
     
     return info
 
 
-def collect_gpu_info() -> List[Dict[str, str]]:
+def collect_gpu_info(probe: Optional[Dict[str, str]] = None) -> List[Dict[str, str]]:
     """
     收集GPU信息
     
+    Args:
+        probe: Linux下_probe_linux()的结果，为None时自行查询
+        
     Returns:
         包含GPU信息的列表，每个元素是一个字典
     """
-    gpu_info = []
-    
     try:
         # 尝试使用nvidia-smi获取GPU信息
         if platform.system() == "Windows":
-            nvidia_smi = subprocess.check_output("nvidia-smi --query-gpu=index,name,driver_version,memory.total,utilization.gpu,temperature.gpu --format=csv,noheader", shell=True).decode()
+            nvidia_smi = subprocess.check_output(_NVIDIA_SMI_CMD, shell=True).decode()
         else:
-            nvidia_smi = subprocess.check_output("nvidia-smi --query-gpu=index,name,driver_version,memory.total,utilization.gpu,temperature.gpu --format=csv,noheader", shell=True).decode()
+            if probe is None:
+                probe = _probe_linux()
+            nvidia_smi = probe["gpu"]
         
-        for line in nvidia_smi.strip().split('\n'):
-            parts = [part.strip() for part in line.split(',')]
-            if len(parts) >= 6:
-                gpu_dict = {
-                    "索引": parts[0],
-                    "名称": parts[1],
-                    "驱动版本": parts[2],
-                    "显存总量": parts[3],
-                    "GPU利用率": parts[4],
-                    "温度": parts[5]
-                }
-                gpu_info.append(gpu_dict)
-    except:
-        # 如果无法获取GPU信息，返回一个包含错误信息的列表
-        return "未检测到NVIDIA GPU或无法访问nvidia-smi"
+        gpu_info = [dict(zip(_GPU_INFO_KEYS, (part.strip() for part in row)))
+                    for row in csv.reader(nvidia_smi.splitlines())
+                    if len(row) >= len(_GPU_INFO_KEYS)]
+    except Exception:
+        # 如果无法获取GPU信息，返回空列表
+        print(f"警告: {_NO_GPU_MESSAGE}")
+        return []
     
     return gpu_info
 
@@ -162,26 +254,27 @@ def format_system_info_markdown(info: Dict[str, Any]) -> str:
     Returns:
         格式化后的Markdown文本
     """
-    markdown = "## 系统信息\n\n"
+    parts = ["## 系统信息\n\n"]
+    append = parts.append
     
     # 添加基本系统信息
     for key, value in info.items():
         if key != "GPU信息":
-            markdown += f"- **{key}:** {value}\n"
+            append(f"- **{key}:** {value}\n")
     
     # 添加GPU信息
-    markdown += "\n### GPU信息\n\n"
-    if isinstance(info["GPU信息"], list):
-        for gpu in info["GPU信息"]:
-            markdown += f"**GPU {gpu['索引']}: {gpu['名称']}**\n"
-            for k, v in gpu.items():
-                if k != "索引" and k != "名称":
-                    markdown += f"- {k}: {v}\n"
-            markdown += "\n"
-    else:
-        markdown += f"{info['GPU信息']}\n\n"
+    append("\n### GPU信息\n\n")
+    gpus = info.get("GPU信息", [])
+    for gpu in gpus:
+        append(f"**GPU {gpu['索引']}: {gpu['名称']}**\n")
+        for k, v in gpu.items():
+            if k != "索引" and k != "名称":
+                append(f"- {k}: {v}\n")
+        append("\n")
+    if not gpus:
+        append(f"{_NO_GPU_MESSAGE}\n\n")
     
-    return markdown
+    return "".join(parts)
 
 
 def format_system_info_text(info: Dict[str, Any]) -> str:
@@ -194,23 +287,24 @@ def format_system_info_text(info: Dict[str, Any]) -> str:
     Returns:
         格式化后的纯文本
     """
-    text = "测试系统信息:\n"
+    parts = ["测试系统信息:\n"]
+    append = parts.append
     
     # 添加基本系统信息
     for key, value in info.items():
         if key != "GPU信息":
-            text += f"{key}: {value}\n"
+            append(f"{key}: {value}\n")
     
     # 添加GPU信息
-    text += "\nGPU信息:\n"
-    if isinstance(info["GPU信息"], list):
-        for gpu in info["GPU信息"]:
-            text += f"GPU {gpu['索引']}: {gpu['名称']}\n"
-            for k, v in gpu.items():
-                if k != "索引" and k != "名称":
-                    text += f"  {k}: {v}\n"
-            text += "\n"
-    else:
-        text += f"{info['GPU信息']}\n"
+    append("\nGPU信息:\n")
+    gpus = info.get("GPU信息", [])
+    for gpu in gpus:
+        append(f"GPU {gpu['索引']}: {gpu['名称']}\n")
+        for k, v in gpu.items():
+            if k != "索引" and k != "名称":
+                append(f"  {k}: {v}\n")
+        append("\n")
+    if not gpus:
+        append(f"{_NO_GPU_MESSAGE}\n")
     
-    return text 
\ No newline at end of file
+    return "".join(parts)
\ No newline at end of file